@@ -1,7 +1,17 @@
 import os
 import json
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, abort, Blueprint, send_from_directory
-from sqlalchemy import text
+import threading
+import hashlib
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from collections import defaultdict
+from operator import itemgetter
+import numpy as np
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, abort, Blueprint, send_from_directory, g
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event, text, select, insert, update, case, and_, or_, func, literal, literal_column, true, union_all
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from werkzeug.utils import secure_filename
 
@@ -10,12 +20,16 @@ from smart_search import smart_search
 from urllib.parse import unquote, quote
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 import secrets
 import re
 from email_service import send_notification
 
+# Значения фильтров цены/площади, которые считаются "не заданными"
+_EMPTY_FILTER_VALUES = frozenset(('0', ''))
+
 def parse_address_components(address_display_name):
     """
     Парсит адрес в формате: Россия, Краснодарский край, Сочи, Кудепста м-н, Искры, 88 лит7
@@ -110,12 +124,85 @@ def update_parsed_addresses():
 class Base(DeclarativeBase):
     pass
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+    
+    Dates, Decimal and UUID are still passed to Flask's default handler, so
+    jsonify() output keeps the same format as with the stdlib provider.
+    """
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY |
+              orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SORT_KEYS)
+    
+    def dumps(self, obj, **kwargs):
+        option = self.option
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 db = SQLAlchemy(model_class=Base)
 
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+app.json = OrjsonProvider(app)
+
+def json_response(data, status=200):
+    """Serialize straight to bytes with orjson, skipping jsonify()'s str round-trip.
+
+    datetime values are emitted natively in ISO 8601 (same as .isoformat());
+    Decimal and other types orjson can't encode fall back to app.json.default,
+    as with jsonify().
+    """
+    return app.response_class(
+        orjson.dumps(data, default=app.json.default,
+                     option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+class JsonResponseCache:
+    """In-process TTL cache of JSON response bodies, replayed as responses.
+
+    Callers that include `version` in their keys can bump() it on writes: a
+    body computed from a read that raced the write is then stored under a
+    stale key and never served. Full caches are simply cleared.
+    """
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.version = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        cached = self.entries.get(key)
+        if cached and cached[0] > time.time():
+            return app.response_class(cached[1], mimetype='application/json')
+        return None
+    
+    def store(self, key, response):
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[key] = (time.time() + self.ttl, response.get_data())
+        return response
+    
+    def pop(self, key):
+        self.entries.pop(key, None)
+    
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self.entries.clear()
+
+def format_date_ru(value, default=None):
+    """dd.mm.yyyy without strftime, for date columns serialized in list loops"""
+    if not value:
+        return default
+    return f"{value.day:02d}.{value.month:02d}.{value.year}"
 
 # Session configuration for better cookie handling
 app.config['SESSION_COOKIE_HTTPONLY'] = True
@@ -132,6 +219,12 @@ app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:/
 app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_recycle": 300,
     "pool_pre_ping": True,
+    # 8 gunicorn threads plus the notification executor and flushers
+    "pool_size": 10,
+    "max_overflow": 20,
+    # Reuse the most recently returned connection, so at low traffic the same
+    # few stay warm instead of every pooled connection idling into pool_recycle
+    "pool_use_lifo": True,
 }
 
 # Configure file uploads
@@ -150,6 +243,12 @@ def uploaded_file(filename):
 # Initialize the app with the extension
 db.init_app(app)
 
+# Models used by the recommendation and manager dashboard handlers, imported once
+# here instead of on every call (models.py imports db from this module)
+from models import (User, Manager, Admin, Application, CallbackRequest, Recommendation, RecommendationCategory,
+                    SentSearch, SavedSearch, ManagerSavedSearch, Collection, CollectionProperty,
+                    ClientPropertyRecommendation, BlogPost, BlogArticle, BlogCategory, blog_search_document)
+
 # Add Jinja2 helper for creating slugs
 @app.template_filter('slug')
 def create_slug_filter(name):
@@ -275,17 +374,27 @@ login_manager.login_message_category = 'info'
 _properties_cache = None
 _cache_timestamp = None
 CACHE_TIMEOUT = 300  # 5 minutes
+# Serializes reloads so that requests arriving when the cache expires wait for
+# one query instead of each reading the whole excel_properties table
+_properties_lock = threading.Lock()
+
+def _properties_cache_fresh():
+    return (_properties_cache is not None and _cache_timestamp is not None and 
+            time.time() - _cache_timestamp < CACHE_TIMEOUT)
 
 def load_properties():
-    """Load properties from database with fallback to JSON files"""
+    """Load properties from database (cached for CACHE_TIMEOUT seconds)"""
+    if not _properties_cache_fresh():
+        with _properties_lock:
+            # Another thread may have reloaded the cache while we waited for the lock
+            if not _properties_cache_fresh():
+                return _load_properties_from_db()
+    print(f"DEBUG: Using cached {len(_properties_cache)} properties")
+    return _properties_cache
+
+def _load_properties_from_db():
+    """Query excel_properties into the property dict format and cache the result"""
     global _properties_cache, _cache_timestamp
-    import time
-    
-    # Check if we have valid cached data
-    if (_properties_cache is not None and _cache_timestamp is not None and 
-        time.time() - _cache_timestamp < CACHE_TIMEOUT):
-        print(f"DEBUG: Using cached {len(_properties_cache)} properties")
-        return _properties_cache
     try:
         # Load from excel_properties table using raw SQL
         sql_query = """
@@ -416,6 +525,123 @@ def load_residential_complexes():
     print("DEBUG: No residential complexes found in database or error loading")
     return []
 
+# In-process cache for the JSON data files used by the manager search API.
+# A file is re-parsed only when its mtime changes.
+PROPERTIES_JSON_PATH = 'data/properties_expanded.json'
+COMPLEXES_JSON_PATH = 'data/residential_complexes.json'
+# Each cache has its own lock so that different files can load concurrently.
+# A reload builds a complete new snapshot ('data', 'by_id', build_extra keys,
+# 'mtime') and publishes it with one reference swap; snapshots are never
+# modified afterwards, so a handler that takes one per request always sees
+# row positions and data from the same file version.
+_PROPS_CACHE = {'snapshot': None, 'lock': threading.Lock()}
+_COMPLEXES_CACHE = {'snapshot': None, 'lock': threading.Lock()}
+
+def _refresh_json_cache(cache, path, build_extra=None):
+    """Reload JSON file if it changed on disk; return the current snapshot dict"""
+    mtime = os.stat(path).st_mtime
+    snapshot = cache['snapshot']
+    if snapshot is not None and snapshot['mtime'] == mtime:
+        return snapshot
+    
+    with cache['lock']:
+        # Another thread may have reloaded the file while we waited for the lock
+        snapshot = cache['snapshot']
+        if snapshot is None or snapshot['mtime'] != mtime:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+            snapshot = {
+                'data': data,
+                'by_id': {str(item.get('id')): item for item in data},
+                **(build_extra(data) if build_extra else {}),
+                'mtime': mtime,
+            }
+            cache['snapshot'] = snapshot
+    return snapshot
+
+def _parse_floor(value):
+    """Floor number from int or '5' / '5/16' style strings"""
+    if isinstance(value, str):
+        try:
+            return int(value.split('/')[0]) if '/' in value else int(value)
+        except:
+            return 0
+    return value or 0
+
+def _build_property_index(data):
+    """Build inverted indexes (filter value -> set of row positions in data)
+    and numeric columns for vectorized range filters"""
+    index = {field: defaultdict(set) for field in ('district', 'developer', 'type', 'rooms', 'complex_id')}
+    for i, prop in enumerate(data):
+        # Text fields are compared case-insensitively, ids and rooms as strings
+        index['district'][(prop.get('district') or '').lower()].add(i)
+        index['developer'][(prop.get('developer') or '').lower()].add(i)
+        index['type'][(prop.get('type') or '').lower()].add(i)
+        index['rooms'][str(prop.get('rooms', ''))].add(i)
+        index['complex_id'][str(prop.get('complex_id', ''))].add(i)
+    
+    prices = np.array([prop.get('price') or 0 for prop in data], dtype=np.int64)
+    # Lowercased once here instead of on every request
+    completion = [(prop.get('completion_date') or '').lower() for prop in data]
+    finishing = [(prop.get('finish_type') or '').lower() for prop in data]
+    return {
+        'index': {field: dict(values) for field, values in index.items()},
+        'prices': prices,
+        'cashbacks': (prices * 0.05).astype(np.int64),  # 5% cashback
+        'areas': np.array([prop.get('area') or 0 for prop in data], dtype=np.float64),
+        'floors': np.array([_parse_floor(prop.get('floor', 0)) for prop in data], dtype=np.int64),
+        'is_delivered': np.array(['сдан' in value for value in completion], dtype=bool),
+        'has_quarter': np.array(['кв.' in value for value in completion], dtype=bool),
+        'finish_rough': np.array(['черновая' in value for value in finishing], dtype=bool),
+        'finish_standard': np.array(['стандартная' in value for value in finishing], dtype=bool),
+        'finish_premium': np.array(['премиум' in value for value in finishing], dtype=bool),
+    }
+
+def _get_properties_cache():
+    return _refresh_json_cache(_PROPS_CACHE, PROPERTIES_JSON_PATH, _build_property_index)
+
+def _get_properties():
+    """Get parsed properties_expanded.json (cached)"""
+    return _get_properties_cache()['data']
+
+def _property_rows(cache, **filters):
+    """Positions (in file order) of rows in the cache snapshot matching all categorical filters.
+    
+    Filter values must be normalized the same way as in _build_property_index;
+    None means the filter is not set. Sets are intersected smallest first, so
+    the most selective filter bounds the work for everything that follows.
+    """
+    index = cache['index']
+    sets = [index[field].get(value, set()) for field, value in filters.items() if value is not None]
+    if not sets:
+        return np.arange(len(cache['data']))
+    
+    sets.sort(key=len)
+    return np.array(sorted(sets[0].intersection(*sets[1:])), dtype=np.intp)
+
+def _get_property_from_json(property_id):
+    """O(1) lookup of a property from properties_expanded.json by id"""
+    return _get_properties_cache()['by_id'].get(str(property_id))
+
+def _get_complexes():
+    """Get parsed residential_complexes.json (cached)"""
+    return _refresh_json_cache(_COMPLEXES_CACHE, COMPLEXES_JSON_PATH)['data']
+
+def _get_complexes_by_id():
+    """Get residential_complexes.json items keyed by str(id) (cached)"""
+    return _refresh_json_cache(_COMPLEXES_CACHE, COMPLEXES_JSON_PATH)['by_id']
+
+def _preload_json_caches():
+    """Load properties and complexes JSON in parallel so that the first
+    search request after a restart doesn't read both files back to back"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_get_properties_cache), executor.submit(_get_complexes)]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error preloading search data: {e}")
+
 def load_blog_articles():
     """Load blog articles from JSON file"""
     try:
@@ -512,7 +738,7 @@ def search_global(query):
                 results.append(result)
     
     # Sort by relevance score (highest first)
-    results.sort(key=lambda x: x['score'], reverse=True)
+    results.sort(key=itemgetter('score'), reverse=True)
     return results[:10]  # Return top 10 results
 
 def get_article_by_slug(slug):
@@ -971,7 +1197,7 @@ def index():
         districts_data[district]['price_from'] = min(districts_data[district]['price_from'], complex.get('price_from', 0))
         districts_data[district]['apartments_count'] += complex.get('apartments_count', 0)
     
-    districts = sorted(districts_data.values(), key=lambda x: x['complexes_count'], reverse=True)[:8]
+    districts = sorted(districts_data.values(), key=itemgetter('complexes_count'), reverse=True)[:8]
     
     # Get featured developers (top 3 with most complexes)
     featured_developers = []
@@ -1708,14 +1934,61 @@ def property_detail(property_id):
         traceback.print_exc()
         return f"Error 500: {str(e)}", 500
 
+# Cyrillic -> Latin for slugs; str.translate maps multi-letter outputs (ж -> zh) in one pass
+_TRANSLIT_TABLE = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
+})
+_SLUG_STRIP = re.compile(r'[^\w\s-]+')
+_SLUG_DASH = re.compile(r'[-\s]+')
+
+def slugify(text):
+    """URL slug: lowercase, punctuation dropped, runs of spaces/hyphens -> '-'"""
+    return _SLUG_DASH.sub('-', _SLUG_STRIP.sub('', text.lower())).strip('-')
+
+def translit_slug(text):
+    """Latin URL slug from a Russian title or name"""
+    return slugify(text.lower().translate(_TRANSLIT_TABLE))
+
+_WORD_RE = re.compile(r'\S+')
+
+def count_words(text):
+    """Whitespace-separated word count without building the list that split() would"""
+    return sum(1 for _ in _WORD_RE.finditer(text or ''))
+
+def unique_slug(model, base, exclude_id=None):
+    """First free slug among base, base-1, base-2, ... using a single lookup"""
+    query = select(model.slug).where((model.slug == base) | model.slug.startswith(f'{base}-', autoescape=True))
+    if exclude_id is not None:
+        query = query.where(model.id != exclude_id)
+    taken = set(db.session.scalars(query))
+    slug, counter = base, 1
+    while slug in taken:
+        slug = f"{base}-{counter}"
+        counter += 1
+    return slug
+
+def add_with_unique_slug(obj, base, attempts=3):
+    """Add obj under the first free slug; re-pick if a concurrent insert takes it first"""
+    for attempt in range(attempts):
+        obj.slug = unique_slug(type(obj), base)
+        try:
+            with db.session.begin_nested():
+                db.session.add(obj)
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+        else:
+            return obj
+
 def create_slug(name):
     """Create SEO-friendly slug from complex name"""
     if not name:
         return "unknown"
     # Remove quotes and special characters, replace spaces with hyphens
-    slug = re.sub(r'["\']', '', name)  # Remove quotes
-    slug = re.sub(r'[^\w\s-]', '', slug)  # Remove special chars except spaces and hyphens
-    slug = re.sub(r'[-\s]+', '-', slug)  # Replace spaces/multiple hyphens with single hyphen
+    slug = _SLUG_DASH.sub('-', _SLUG_STRIP.sub('', name))
     return slug.lower().strip('-')
 
 @app.route('/residential_complex/<int:complex_id>')
@@ -2278,8 +2551,6 @@ def contacts():
 @app.route('/blog')
 def blog():
     """Blog main page with articles listing, search, and categories"""
-    from models import BlogPost, BlogCategory
-    from sqlalchemy import text
     
     # Get search parameters  
     search_query = request.args.get('search', '')
@@ -2323,10 +2594,15 @@ def blog():
         BlogPost.created_at.desc()
     ).paginate(page=page, per_page=per_page, error_out=False)
     
-    # Get categories with article counts
+    # Get categories with article counts (one grouped count for all categories)
+    published_counts = dict(db.session.execute(
+        select(BlogPost.category, func.count())
+        .where(BlogPost.status == 'published')
+        .group_by(BlogPost.category)
+    ).all())
     categories = []
     for category in BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all():
-        article_count = BlogPost.query.filter_by(category=category.name, status='published').count()
+        article_count = published_counts.get(category.name, 0)
         if article_count > 0:
             category.articles_count = article_count
             categories.append(category)
@@ -2349,7 +2625,6 @@ def blog():
 @app.route('/blog/category/<category_slug>')
 def blog_category(category_slug):
     """Blog category page"""
-    from models import BlogPost, BlogCategory
     
     # Поиск категории по slug или по имени
     category = BlogCategory.query.filter(
@@ -2394,7 +2669,7 @@ def streets():
     streets_data = load_streets()
     
     # Sort streets alphabetically
-    streets_data.sort(key=lambda x: x['name'])
+    streets_data.sort(key=itemgetter('name'))
     
     return render_template('streets.html', 
                          streets=streets_data)
@@ -3931,7 +4206,6 @@ def setup_password():
         flash('Сессия истекла', 'error')
         return redirect(url_for('login'))
     
-    from models import User
     user = User.query.get(temp_user_id)
     if not user or not user.needs_password_setup():
         flash('Пользователь не найден или пароль уже установлен', 'error')
@@ -3953,9 +4227,10 @@ def setup_password():
             flash('Пароли не совпадают', 'error')
             return render_template('auth/setup_password.html', user=user)
         
-        # Set password
+        # Set password (and the login time, in the same commit)
         user.set_password(password)
         user.is_verified = True
+        user.last_login = datetime.utcnow()
         db.session.commit()
         
         # Clear temp session
@@ -3963,8 +4238,6 @@ def setup_password():
         
         # Login user
         login_user(user)
-        user.last_login = datetime.utcnow()
-        db.session.commit()
         
         flash('Пароль успешно установлен!', 'success')
         return redirect(url_for('dashboard'))
@@ -4042,10 +4315,15 @@ def callback_request_page():
     """Show callback request page"""
     return render_template('callback_request.html')
 
+# Numbers in a budget string like "3-5 млн" or "4,5 млн руб"
+_BUDGET_RE = re.compile(r'\d+(?:[.,]\d+)?')
+
+def _budget_numbers(budget):
+    return [float(number.replace(',', '.')) for number in _BUDGET_RE.findall(budget)]
+
 @app.route('/api/property-selection', methods=['POST'])
 def property_selection():
     """Property selection application"""
-    from models import Application, User
     data = request.get_json()
     
     try:
@@ -4092,14 +4370,13 @@ def property_selection():
         # Send Telegram notification
         try:
             from telegram_bot import send_telegram_message
-            from datetime import datetime
             
             # Calculate potential cashback (2% of average budget)
             potential_cashback = ""
             if budget_range:
                 if "млн" in budget_range:
                     # Extract average from range like "3-5 млн"
-                    numbers = [float(x) for x in budget_range.replace(" млн", "").split("-") if x.strip().replace(".", "").replace(",", "").isdigit()]
+                    numbers = _budget_numbers(budget_range)
                     if numbers:
                         avg_price = sum(numbers) / len(numbers) * 1000000
                         cashback = int(avg_price * 0.02)
@@ -4146,7 +4423,6 @@ def property_selection():
 @app.route('/api/callback-request', methods=['POST'])
 def api_callback_request():
     """Submit callback request"""
-    from models import CallbackRequest, Manager
     data = request.get_json()
     
     try:
@@ -4420,7 +4696,6 @@ def upload_documents():
     """Upload documents"""
     from models import Document
     import os
-    from werkzeug.utils import secure_filename
     from datetime import datetime
     
     if 'files' not in request.files:
@@ -4597,14 +4872,14 @@ def manager_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         manager_id = session.get('manager_id')
-        print(f"DEBUG: manager_required check - manager_id: {manager_id}")
+        app.logger.debug("manager_required check - manager_id: %s", manager_id)
         if not manager_id:
-            print(f"DEBUG: manager_required - no manager_id, rejecting request")
+            app.logger.debug("manager_required - no manager_id, rejecting request")
             # For AJAX requests, return JSON error instead of redirect
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.content_type == 'application/json':
                 return jsonify({'success': False, 'error': 'Authentication required'}), 401
             return redirect(url_for('manager_login'))
-        print(f"DEBUG: manager_required - authentication passed")
+        app.logger.debug("manager_required - authentication passed")
         return f(*args, **kwargs)
     return decorated_function
 
@@ -5050,7 +5325,7 @@ def get_collection_properties(collection_id):
         })
     
     # Sort by order_index
-    properties_data.sort(key=lambda x: x['order_index'])
+    properties_data.sort(key=itemgetter('order_index'))
     
     return jsonify({
         'collection': {
@@ -5068,7 +5343,6 @@ def get_collection_properties(collection_id):
 @login_required
 def api_save_search():
     """Save a search with filters"""
-    from models import SavedSearch
     
     data = request.get_json()
     name = data.get('name')
@@ -5095,7 +5369,6 @@ def api_save_search():
 @app.route('/api/manager/searches', methods=['POST'])
 def api_manager_save_search():
     """Save a search for a manager"""
-    from models import ManagerSavedSearch, Manager, SentSearch
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
@@ -5119,10 +5392,10 @@ def api_manager_save_search():
         search.created_at = datetime.utcnow()
         
         db.session.add(search)
-        db.session.commit()
         
         # If client email provided, also create sent search record and send notification
         if client_email:
+            db.session.flush()  # assigns search.id
             sent_search = SentSearch()
             sent_search.saved_search_id = search.id
             sent_search.recipient_email = client_email
@@ -5150,6 +5423,7 @@ def api_manager_save_search():
                 print(f"Failed to send email notification: {email_error}")
                 return jsonify({'success': True, 'search_id': search.id, 'sent_to_client': False, 'email_error': str(email_error)})
         
+        db.session.commit()
         return jsonify({'success': True, 'search_id': search.id, 'sent_to_client': False})
         
     except Exception as e:
@@ -5159,8 +5433,6 @@ def api_manager_save_search():
 @app.route('/api/manager/send_recommendation', methods=['POST'])
 def api_manager_send_recommendation():
     """Send a recommendation (property or complex) to a client"""
-    from models import Recommendation, Manager, User, RecommendationCategory
-    from datetime import datetime
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
@@ -5252,6 +5524,9 @@ def api_manager_send_recommendation():
             category.last_used = datetime.utcnow()
         
         db.session.commit()
+        if category:
+            _invalidate_categories_cache()
+        _invalidate_manager_widgets(manager_id)
         
         # Send notification to client
         manager = Manager.query.get(manager_id)
@@ -5372,6 +5647,7 @@ def api_manager_delete_recommendation(recommendation_id):
         
         db.session.delete(recommendation)
         db.session.commit()
+        _invalidate_manager_widgets(manager_id)
         
         return jsonify({'success': True, 'message': 'Рекомендация успешно удалена'})
         
@@ -5383,13 +5659,16 @@ def api_manager_delete_recommendation(recommendation_id):
 @manager_required
 def api_manager_get_clients_list():
     """Get manager's clients for filters"""
-    from models import User
     
     manager_id = session.get('manager_id')
     
     try:
         # Get clients assigned to this manager or all buyers
-        clients = User.query.filter_by(role='buyer').order_by(User.full_name).all()
+        clients = db.session.execute(
+            select(User.id, User.full_name, User.email)
+            .where(User.role == 'buyer')
+            .order_by(User.full_name)
+        ).all()
         
         clients_data = []
         for client in clients:
@@ -5456,7 +5735,6 @@ def api_search_properties():
 @manager_required
 def api_send_property_to_client():
     """Send saved search results to client via email"""
-    from models import SavedSearch, User, ClientPropertyRecommendation
     
     data = request.get_json()
     client_id = data.get('client_id')
@@ -5478,7 +5756,7 @@ def api_send_property_to_client():
             return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
         
         # Get search filters
-        filters = json.loads(search.filters) if search.filters else {}
+        filters = search.filters_dict
         
         # Filter properties based on search criteria
         properties = load_properties()
@@ -5488,8 +5766,9 @@ def api_send_property_to_client():
         recommendation = ClientPropertyRecommendation()
         recommendation.client_id = client_id
         recommendation.manager_id = session.get('manager_id')
+        recommendation.search_id = search.id
         recommendation.search_name = search.name
-        recommendation.search_filters = search.filters
+        recommendation.search_filters = search.additional_filters
         recommendation.message = message
         recommendation.properties_count = len(filtered_properties)
         recommendation.sent_at = datetime.utcnow()
@@ -6143,8 +6422,11 @@ def init_search_data():
         ('Панорама', 'panorama'), ('Музыкальный', 'muzykalnyy')
     ]
     
+    existing = set(db.session.scalars(
+        select(District.slug).where(District.slug.in_([slug for _, slug in districts_data]))
+    ))
     for name, slug in districts_data:
-        if not District.query.filter_by(slug=slug).first():
+        if slug not in existing:
             district = District(name=name, slug=slug)
             db.session.add(district)
     
@@ -6155,8 +6437,11 @@ def init_search_data():
         ('4-комнатная квартира', 4), ('Пентхаус', 5)
     ]
     
+    existing = set(db.session.scalars(
+        select(RoomType.name).where(RoomType.name.in_([name for name, _ in room_types_data]))
+    ))
     for name, rooms_count in room_types_data:
-        if not RoomType.query.filter_by(name=name).first():
+        if name not in existing:
             room_type = RoomType(name=name, rooms_count=rooms_count)
             db.session.add(room_type)
     
@@ -6169,8 +6454,11 @@ def init_search_data():
         ('Премьер', 'premier')
     ]
     
+    existing = set(db.session.scalars(
+        select(Developer.slug).where(Developer.slug.in_([slug for _, slug in developers_data]))
+    ))
     for name, slug in developers_data:
-        if not Developer.query.filter_by(slug=slug).first():
+        if slug not in existing:
             developer = Developer(name=name, slug=slug)
             db.session.add(developer)
     
@@ -6183,8 +6471,11 @@ def init_search_data():
         ('Флагман', 'flagman', 4, 4)
     ]
     
+    existing = set(db.session.scalars(
+        select(ResidentialComplex.slug).where(ResidentialComplex.slug.in_([row[1] for row in complexes_data]))
+    ))
     for name, slug, district_id, developer_id in complexes_data:
-        if not ResidentialComplex.query.filter_by(slug=slug).first():
+        if slug not in existing:
             complex = ResidentialComplex(name=name, slug=slug, district_id=district_id, developer_id=developer_id)
             db.session.add(complex)
     
@@ -6301,7 +6592,6 @@ def admin_cashback_requests():
 @admin_required
 def update_callback_request_status(request_id):
     """Update callback request status"""
-    from models import CallbackRequest
     
     try:
         data = request.get_json()
@@ -6901,7 +7191,6 @@ def admin_edit_manager(manager_id):
 @admin_required
 def admin_blog():
     """Blog management page"""
-    from models import Admin, BlogPost
     
     admin_id = session.get('admin_id')
     current_admin = Admin.query.get(admin_id)
@@ -6945,8 +7234,6 @@ def admin_blog():
 @admin_required
 def admin_create_post():
     """Create new blog post with full TinyMCE integration"""
-    from models import Admin, BlogPost, BlogCategory
-    import re
     
     admin_id = session.get('admin_id')
     current_admin = Admin.query.get(admin_id)
@@ -6982,25 +7269,8 @@ def admin_create_post():
             slug = request.form.get('slug', '')
             if not slug:
                 # Auto-generate slug from title
-                def transliterate(text):
-                    rus_to_eng = {
-                        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z',
-                        'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
-                        'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
-                        'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
-                    }
-                    return ''.join(rus_to_eng.get(char.lower(), char) for char in text)
-                
-                slug = transliterate(title.lower())
-                slug = re.sub(r'[^\w\s-]', '', slug)
-                slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+                slug = translit_slug(title)
             
-            # Ensure unique slug
-            original_slug = slug
-            counter = 1
-            while BlogPost.query.filter_by(slug=slug).first():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
             
             post = BlogPost(
                 title=title,
@@ -7021,13 +7291,9 @@ def admin_create_post():
             if post.status == 'published':
                 post.published_at = datetime.utcnow()
             
-            db.session.add(post)
+            add_with_unique_slug(post, slug)
             db.session.commit()
-            
-            # Update category article count
-            if post.status == 'published':
-                category.articles_count = BlogPost.query.filter_by(category=category.name, status='published').count()
-                db.session.commit()
+            _invalidate_blog_list_cache()
             
             flash('Статья успешно создана!', 'success')
             return redirect(url_for('admin_blog'))
@@ -7161,8 +7427,6 @@ def admin_cashback_analytics():
 @admin_required  
 def admin_edit_article(article_id):
     """Edit blog article"""
-    from models import Admin, BlogPost
-    import re
     
     admin_id = session.get('admin_id')
     current_admin = Admin.query.get(admin_id)
@@ -7183,7 +7447,7 @@ def admin_edit_article(article_id):
         
         # Auto-generate slug if empty
         if not article.slug:
-            slug = re.sub(r'[^\w\s-]', '', article.title.lower())
+            slug = _SLUG_STRIP.sub('', article.title.lower())
             slug = re.sub(r'[\s_-]+', '-', slug)
             article.slug = slug.strip('-')
         
@@ -7222,7 +7486,6 @@ def admin_edit_article(article_id):
 @admin_required
 def admin_delete_article(article_id):
     """Delete blog article"""
-    from models import BlogPost
     
     article = BlogPost.query.get_or_404(article_id)
     
@@ -7240,7 +7503,6 @@ def admin_delete_article(article_id):
 @admin_required
 def admin_publish_article(article_id):
     """Publish blog article"""
-    from models import BlogPost
     
     article = BlogPost.query.get_or_404(article_id)
     article.status = 'published'
@@ -7372,7 +7634,7 @@ def security():
 
 if __name__ == '__main__':
     with app.app_context():
-        from models import User, CashbackRecord, Application, Favorite, Notification, District, Developer, ResidentialComplex, Street, RoomType, Admin, BlogPost, City
+        from models import User, CashbackRecord, Favorite, Notification, District, Developer, ResidentialComplex, Street, RoomType, Admin, BlogPost, City
         db.create_all()
         
         # Initialize cities
@@ -7514,6 +7776,7 @@ def save_collection():
                 db.session.add(collection_property)
         
         db.session.commit()
+        _invalidate_manager_widgets(manager_id)
         
         action_text = 'отправлена клиенту' if action == 'send' else 'сохранена как черновик'
         flash(f'Подборка "{title}" успешно {action_text}', 'success')
@@ -7838,16 +8101,24 @@ def send_search_to_client():
 @manager_required
 def delete_manager_saved_search(search_id):
     """Delete manager's saved search"""
-    from models import ManagerSavedSearch
     
     manager_id = session.get('manager_id')
     
     try:
-        search = ManagerSavedSearch.query.filter_by(id=search_id, manager_id=manager_id).first()
-        if not search:
+        # Bulk-запросы вместо SELECT + ORM delete: строку не нужно загружать в сессию.
+        # История отправок сохраняется, ссылка на шаблон обнуляется (как при ORM-удалении).
+        owned_search = db.session.query(ManagerSavedSearch.id).filter_by(id=search_id, manager_id=manager_id)
+        db.session.query(SentSearch).filter(
+            SentSearch.manager_search_id.in_(owned_search.scalar_subquery())
+        ).update({SentSearch.manager_search_id: None}, synchronize_session=False)
+        
+        deleted = db.session.query(ManagerSavedSearch).filter_by(
+            id=search_id, manager_id=manager_id
+        ).delete(synchronize_session=False)
+        if not deleted:
+            db.session.rollback()
             return jsonify({'success': False, 'error': 'Поиск не найден'}), 404
             
-        db.session.delete(search)
         db.session.commit()
         
         return jsonify({'success': True, 'message': 'Поиск удалён'})
@@ -8183,7 +8454,6 @@ def init_cities():
 @api_bp.route('/searches', methods=['POST'])
 def save_search():
     """Save user search parameters with manager-to-client sharing functionality"""
-    from models import SavedSearch, User
     data = request.get_json()
     
     # Check authentication using helper function
@@ -8239,13 +8509,13 @@ def save_search():
             elif filter_data['completion']:
                 filters['completion'] = [filter_data['completion']]
                 
-        if 'priceFrom' in filter_data and filter_data['priceFrom'] and str(filter_data['priceFrom']) not in ['0', '']:
+        if 'priceFrom' in filter_data and filter_data['priceFrom'] and str(filter_data['priceFrom']) not in _EMPTY_FILTER_VALUES:
             filters['priceFrom'] = str(filter_data['priceFrom'])
-        if 'priceTo' in filter_data and filter_data['priceTo'] and str(filter_data['priceTo']) not in ['0', '']:
+        if 'priceTo' in filter_data and filter_data['priceTo'] and str(filter_data['priceTo']) not in _EMPTY_FILTER_VALUES:
             filters['priceTo'] = str(filter_data['priceTo'])
-        if 'areaFrom' in filter_data and filter_data['areaFrom'] and str(filter_data['areaFrom']) not in ['0', '']:
+        if 'areaFrom' in filter_data and filter_data['areaFrom'] and str(filter_data['areaFrom']) not in _EMPTY_FILTER_VALUES:
             filters['areaFrom'] = str(filter_data['areaFrom'])
-        if 'areaTo' in filter_data and filter_data['areaTo'] and str(filter_data['areaTo']) not in ['0', '']:
+        if 'areaTo' in filter_data and filter_data['areaTo'] and str(filter_data['areaTo']) not in _EMPTY_FILTER_VALUES:
             filters['areaTo'] = str(filter_data['areaTo'])
             
         print(f"DEBUG: Extracted filters from {filter_data}: {filters}")
@@ -8435,7 +8705,16 @@ def save_search():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 def check_api_authentication():
-    """Helper function to check API authentication for both users and managers"""
+    """Helper function to check API authentication for both users and managers.
+    
+    The result is memoized on flask.g, so repeated calls within one request
+    don't reload the user from the database.
+    """
+    if 'api_auth_info' not in g:
+        g.api_auth_info = _resolve_api_authentication()
+    return g.api_auth_info
+
+def _resolve_api_authentication():
     # Check if manager is logged in
     if 'manager_id' in session:
         from models import Manager
@@ -8459,29 +8738,49 @@ def check_api_authentication():
 @app.route('/api/searches', methods=['GET'])
 def get_saved_searches():
     """Get user's saved searches"""
-    from models import SavedSearch
     
     # Check authentication using helper function
     auth_info = check_api_authentication()
     if not auth_info:
         return jsonify({'success': False, 'error': 'Не авторизован'}), 401
     
-    # Get saved searches for the authenticated user (manager or regular user) 
-    searches = SavedSearch.query.filter_by(user_id=auth_info['user_id']).order_by(SavedSearch.created_at.desc()).all()
+    # Cheap version token for the list: any insert, update or delete changes
+    # either the row count or the latest updated_at
+    searches_count, latest_update = db.session.query(
+        func.count(SavedSearch.id), func.max(SavedSearch.updated_at)
+    ).filter(SavedSearch.user_id == auth_info['user_id']).one()
+    etag = f"{auth_info['type']}-{auth_info['user_id']}-{searches_count}-{latest_update.timestamp() if latest_update else 0}"
     
-    return jsonify({
-        'success': True,
-        'searches': [search.to_dict() for search in searches]
-    })
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        # Get saved searches for the authenticated user (manager or regular user).
+        # Plain column rows: to_dict() touches no relationships, so ORM entities aren't needed
+        searches = db.session.execute(
+            select(*[getattr(SavedSearch, column) for column in SavedSearch.DICT_COLUMNS])
+            .where(SavedSearch.user_id == auth_info['user_id'])
+            .order_by(SavedSearch.created_at.desc())
+        ).all()
+        
+        response = jsonify({
+            'success': True,
+            'searches': [SavedSearch.serialize(search) for search in searches]
+        })
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @app.route('/api/user/saved-searches/count')
 @login_required
 def get_user_saved_searches_count():
     """Get count of user's saved searches"""
-    from models import SavedSearch
     
     try:
-        count = SavedSearch.query.filter_by(user_id=current_user.id).count()
+        # Plain COUNT(*) instead of Query.count(), which wraps the query in a subquery
+        count = db.session.query(func.count(SavedSearch.id)).filter(
+            SavedSearch.user_id == current_user.id
+        ).scalar()
         return jsonify({
             'success': True,
             'count': count
@@ -8494,46 +8793,39 @@ def get_user_saved_searches_count():
 def get_saved_search(search_id):
     """Get saved search by ID - supports both user searches and manager shared searches"""
     try:
-        from models import SavedSearch, SentSearch
-        
-        # First try user's own saved search
-        search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first()
-        
-        # If not found, try manager shared search via SentSearch table
-        if not search:
-            sent_search = SentSearch.query.filter_by(
-                client_id=current_user.id
-            ).join(SavedSearch, SentSearch.manager_search_id == SavedSearch.id).filter(
-                SavedSearch.id == search_id
-            ).first()
-            
-            if sent_search:
-                search = SavedSearch.query.get(search_id)
-                # Use the additional_filters from sent_search if available
-                if sent_search.additional_filters:
-                    search._temp_filters = sent_search.additional_filters
         
-        # If still not found, check if it's a global search available to all users
-        if not search:
-            search = SavedSearch.query.get(search_id)
-            if search and not search.user_id:  # Global searches have no user_id
-                pass  # Allow access
-            else:
-                search = None
+        # One query covers all access paths, in order of priority:
+        # user's own search, search shared by a manager via SentSearch,
+        # global search (no user_id)
+        is_own = SavedSearch.user_id == current_user.id
+        row = db.session.query(SavedSearch, SentSearch.additional_filters).outerjoin(
+            SentSearch, and_(
+                SentSearch.manager_search_id == SavedSearch.id,
+                SentSearch.client_id == current_user.id
+            )
+        ).filter(
+            SavedSearch.id == search_id,
+            or_(is_own, SentSearch.id.isnot(None), SavedSearch.user_id.is_(None))
+        ).order_by(case((is_own, 0), else_=1)).first()
         
-        if not search:
+        if not row:
             return jsonify({'success': False, 'error': 'Поиск не найден'})
         
-        # Parse filters - check for temp filters from sent search first
+        # The SavedSearch comes from the same row as the SentSearch filters,
+        # no separate fetch of the search is needed
+        search, sent_filters = row
+        
+        # Parse filters - filters from the sent search take precedence
+        # for searches shared by a manager
         filters = {}
-        if hasattr(search, '_temp_filters') and search._temp_filters:
+        if search.user_id != current_user.id and sent_filters:
             try:
-                filters = json.loads(search._temp_filters)
+                filters = orjson.loads(sent_filters)
             except:
                 filters = {}
         elif search.additional_filters:
             try:
-                filters = json.loads(search.additional_filters)
+                filters = search.filters_dict
             except:
                 filters = {}
         
@@ -8575,6 +8867,50 @@ def delete_saved_search(search_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# SavedSearch.last_used updates are coalesced and written in one UPDATE
+# every LAST_USED_FLUSH_INTERVAL seconds instead of a commit per click
+LAST_USED_FLUSH_INTERVAL = 5
+_LAST_USED_QUEUE = {}
+_LAST_USED_LOCK = threading.Lock()
+_last_used_flusher = None
+
+def _queue_last_used(search_id, used_at):
+    """Schedule a last_used update, starting the flusher thread on first use"""
+    global _last_used_flusher
+    with _LAST_USED_LOCK:
+        _LAST_USED_QUEUE[search_id] = used_at
+        if _last_used_flusher is None:
+            _last_used_flusher = threading.Thread(target=_last_used_flush_loop, daemon=True)
+            _last_used_flusher.start()
+
+def _flush_last_used():
+    """Write all pending last_used values with a single UPDATE ... CASE"""
+    with _LAST_USED_LOCK:
+        pending = dict(_LAST_USED_QUEUE)
+        _LAST_USED_QUEUE.clear()
+    if not pending:
+        return
+    
+    with app.app_context():
+        try:
+            db.session.execute(
+                update(SavedSearch)
+                .where(SavedSearch.id.in_(pending))
+                .values(last_used=case(pending, value=SavedSearch.id))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error flushing saved search last_used: {e}")
+
+def _last_used_flush_loop():
+    while True:
+        time.sleep(LAST_USED_FLUSH_INTERVAL)
+        _flush_last_used()
+
+atexit.register(_flush_last_used)
+
 @app.route('/api/searches/<int:search_id>/apply', methods=['POST'])
 def apply_saved_search(search_id):
     """Apply saved search and update last_used"""
@@ -8594,18 +8930,18 @@ def apply_saved_search(search_id):
         return jsonify({'success': False, 'error': 'Поиск не найден'}), 404
     
     try:
-        search.last_used = datetime.utcnow()
-        db.session.commit()
+        # Written later by the last_used flusher
+        used_at = datetime.utcnow()
+        _queue_last_used(search.id, used_at)
         
         # Parse filters from saved search
         filters = {}
         if search.additional_filters:
             try:
-                filters = json.loads(search.additional_filters)
-                print(f"DEBUG: Loaded filters from additional_filters: {filters}")
+                # Copy: legacy fields are merged into this dict below
+                filters = dict(search.filters_dict)
             except json.JSONDecodeError as e:
-                print(f"DEBUG: Error parsing additional_filters: {e}")
-                pass
+                app.logger.debug("Error parsing additional_filters of search %s: %s", search.id, e)
         
         # Include legacy fields as filters if not already in additional_filters
         if search.location and 'districts' not in filters:
@@ -8626,15 +8962,13 @@ def apply_saved_search(search_id):
         if search.size_max and 'areaTo' not in filters:
             filters['areaTo'] = str(search.size_max)
         
-        print(f"DEBUG: Search '{search.name}' raw data - additional_filters: {search.additional_filters}, price_min: {search.price_min}, price_max: {search.price_max}")
-        print(f"DEBUG: Final filters for '{search.name}': {filters}")
-            
-        print(f"DEBUG: Applying search '{search.name}' with filters: {filters}")
+        app.logger.debug("Applying search %r with filters: %r", search.name, filters)
         
         try:
             search_dict = search.to_dict()
+            search_dict['last_used'] = used_at.strftime('%d.%m.%Y в %H:%M')
         except Exception as e:
-            print(f"DEBUG: Error in search.to_dict(): {e}")
+            app.logger.debug("Error in search.to_dict(): %s", e)
             search_dict = {
                 'id': search.id,
                 'name': search.name,
@@ -8678,7 +9012,6 @@ def send_property_to_client_endpoint():
             return jsonify({'success': False, 'error': 'Search not found'}), 404
         
         # Create recommendation record
-        from models import ClientPropertyRecommendation
         recommendation = ClientPropertyRecommendation(
             manager_id=current_user.id,
             client_id=client_id,
@@ -8737,37 +9070,33 @@ def search_properties_api():
         price_max = request.args.get('price_max')
         area_min = request.args.get('area_min')
         
-        # Load properties from JSON file
-        with open('data/properties_expanded.json', 'r', encoding='utf-8') as f:
-            properties_data = json.load(f)
+        cache = _get_properties_cache()
+        properties_data = cache['data']
+        
+        # Categorical filters are resolved through the inverted indexes,
+        # the remaining predicates only look at the rows that survived them
+        rows = _property_rows(
+            cache,
+            district=district.lower() if district else None,
+            developer=developer.lower() if developer else None,
+            rooms=str(rooms) if rooms else None,
+            type=prop_type.lower() if prop_type else None,
+        )
+        
+        # Price and area filters over the numeric columns
+        if price_min:
+            rows = rows[cache['prices'][rows] >= int(price_min)]
+        if price_max:
+            rows = rows[cache['prices'][rows] <= int(price_max)]
+        if area_min:
+            rows = rows[cache['areas'][rows] >= float(area_min)]
         
+        cashbacks = cache['cashbacks']
         filtered_properties = []
-        for prop in properties_data:
-            # Apply filters
-            if district and prop.get('district', '').lower() != district.lower():
-                continue
-            if developer and prop.get('developer', '').lower() != developer.lower():
-                continue
-            if rooms and str(prop.get('rooms', '')) != str(rooms):
-                continue
-            if prop_type and prop.get('type', '').lower() != prop_type.lower():
-                continue
-            
-            # Price filters
-            prop_price = prop.get('price', 0)
-            if price_min and prop_price < int(price_min):
-                continue
-            if price_max and prop_price > int(price_max):
-                continue
-            
-            # Area filter
-            prop_area = prop.get('area', 0)
-            if area_min and prop_area < float(area_min):
-                continue
-            
-            # Calculate cashback
+        # Limit results to 20
+        for i in rows[:20]:
+            prop = properties_data[i]
             price = prop.get('price', 0)
-            cashback = int(price * 0.05)  # 5% cashback
             
             filtered_properties.append({
                 'id': prop.get('id'),
@@ -8776,15 +9105,12 @@ def search_properties_api():
                 'developer': prop.get('developer', ''),
                 'rooms': prop.get('rooms', 0),
                 'price': price,
-                'cashback': cashback,
+                'cashback': int(cashbacks[i]),
                 'area': prop.get('area', 0),
                 'floor': prop.get('floor', ''),
                 'type': prop.get('type', '')
             })
         
-        # Limit results to 20
-        filtered_properties = filtered_properties[:20]
-        
         return jsonify({
             'success': True,
             'properties': filtered_properties
@@ -8811,90 +9137,70 @@ def search_apartments_api():
         finishing = request.args.get('finishing')
         
         # Load properties and complexes
-        with open('data/properties_expanded.json', 'r', encoding='utf-8') as f:
-            properties_data = json.load(f)
+        cache = _get_properties_cache()
+        properties_data = cache['data']
         
         # Load complexes data for additional info
         complexes_data = {}
         try:
-            with open('data/residential_complexes.json', 'r', encoding='utf-8') as f:
-                complexes_list = json.load(f)
-                for complex_item in complexes_list:
-                    complexes_data[complex_item.get('id')] = complex_item
+            complexes_data = _get_complexes_by_id()
         except:
             pass
         
+        # Categorical filters are resolved through the inverted indexes.
+        # 'студия' is stored in the type field, other room counts in rooms.
+        # The remaining predicates only look at the rows that survived them
+        rows = _property_rows(
+            cache,
+            district=district.lower() if district else None,
+            developer=developer.lower() if developer else None,
+            type='студия' if rooms == 'студия' else None,
+            rooms=str(rooms) if rooms and rooms != 'студия' else None,
+            complex_id=str(complex_id) if complex_id else None,
+        )
+        
+        # Price, area and floor filters over the numeric columns
+        if price_min:
+            rows = rows[cache['prices'][rows] >= int(price_min)]
+        if price_max:
+            rows = rows[cache['prices'][rows] <= int(price_max)]
+        if area_min:
+            rows = rows[cache['areas'][rows] >= float(area_min)]
+        if area_max:
+            rows = rows[cache['areas'][rows] <= float(area_max)]
+        if floor_min:
+            rows = rows[cache['floors'][rows] >= int(floor_min)]
+        if floor_max:
+            rows = rows[cache['floors'][rows] <= int(floor_max)]
+        
+        # Status and finishing filters over precomputed flags
+        if status == 'в продаже':
+            rows = rows[~cache['is_delivered'][rows]]
+        elif status == 'строительство':
+            rows = rows[cache['has_quarter'][rows]]
+        elif status == 'сдан':
+            rows = rows[cache['is_delivered'][rows]]
+        
+        if finishing == 'черновая':
+            rows = rows[cache['finish_rough'][rows]]
+        elif finishing == 'чистовая':
+            rows = rows[cache['finish_standard'][rows]]
+        elif finishing == 'под ключ':
+            rows = rows[cache['finish_premium'][rows]]
+        
+        # Sort by price (default) and limit results to 50 before building the
+        # response rows; stable sort keeps file order for equal prices
+        rows = rows[np.argsort(cache['prices'][rows], kind='stable')][:50]
+        
+        is_delivered = cache['is_delivered']
+        cashbacks = cache['cashbacks']
         filtered_apartments = []
-        for prop in properties_data:
-            # Apply filters
-            if district and prop.get('district', '').lower() != district.lower():
-                continue
-            if developer and prop.get('developer', '').lower() != developer.lower():
-                continue
-            
-            # Handle rooms filter including 'студия'
-            prop_rooms = prop.get('rooms', '')
-            if rooms:
-                if rooms == 'студия' and prop.get('type', '') != 'студия':
-                    continue
-                elif rooms != 'студия' and str(prop_rooms) != str(rooms):
-                    continue
-                    
-            if complex_id and str(prop.get('complex_id', '')) != str(complex_id):
-                continue
-            
-            # Price filters
-            prop_price = prop.get('price', 0)
-            if price_min and prop_price < int(price_min):
-                continue
-            if price_max and prop_price > int(price_max):
-                continue
-            
-            # Area filter
-            prop_area = prop.get('area', 0)
-            if area_min and prop_area < float(area_min):
-                continue
-            if area_max and prop_area > float(area_max):
-                continue
-            
-            # Floor filters - use correct field name
-            prop_floor = prop.get('floor', 0)
-            if isinstance(prop_floor, str):
-                try:
-                    prop_floor = int(prop_floor.split('/')[0]) if '/' in prop_floor else int(prop_floor)
-                except:
-                    prop_floor = 0
-            
-            if floor_min and prop_floor < int(floor_min):
-                continue
-            if floor_max and prop_floor > int(floor_max):
-                continue
-            
-            # Status and finishing filters
-            prop_status = prop.get('completion_date', '').lower()
-            if status:
-                if status == 'в продаже' and 'сдан' in prop_status:
-                    continue
-                elif status == 'строительство' and 'кв.' not in prop_status:
-                    continue
-                elif status == 'сдан' and 'сдан' not in prop_status:
-                    continue
-                    
-            prop_finishing = prop.get('finish_type', '').lower()
-            if finishing:
-                if finishing == 'черновая' and 'черновая' not in prop_finishing:
-                    continue
-                elif finishing == 'чистовая' and 'стандартная' not in prop_finishing:
-                    continue
-                elif finishing == 'под ключ' and 'премиум' not in prop_finishing:
-                    continue
-            
-            # Calculate cashback
+        for i in rows:
+            prop = properties_data[i]
             price = prop.get('price', 0)
-            cashback = int(price * 0.05)  # 5% cashback
             
             # Get complex info
-            complex_info = complexes_data.get(prop.get('complex_id'), {})
+            complex_info = complexes_data.get(str(prop.get('complex_id')), {})
             
             filtered_apartments.append({
                 'id': prop.get('id'),
@@ -8904,24 +9210,18 @@ def search_apartments_api():
                 'developer': prop.get('developer', ''),
                 'rooms': prop.get('type', '') if prop.get('type', '') == 'студия' else prop.get('rooms', 0),
                 'price': price,
-                'cashback': cashback,
+                'cashback': int(cashbacks[i]),
                 'area': prop.get('area', 0),
                 'floor': prop.get('floor', ''),
                 'max_floor': prop.get('total_floors', ''),
                 'type': prop.get('type', ''),
-                'status': 'сдан' if 'сдан' in prop.get('completion_date', '').lower() else 'строительство',
+                'status': 'сдан' if is_delivered[i] else 'строительство',
                 'finishing': prop.get('finish_type', ''),
                 'images': prop.get('gallery', []) or [prop.get('image', '')] if prop.get('image') else complex_info.get('images', []),
                 'description': prop.get('description', ''),
                 'features': prop.get('advantages', [])
             })
         
-        # Sort by price (default)
-        filtered_apartments.sort(key=lambda x: x['price'])
-        
-        # Limit results to 50
-        filtered_apartments = filtered_apartments[:50]
-        
         return jsonify({
             'success': True,
             'apartments': filtered_apartments,
@@ -8931,22 +9231,29 @@ def search_apartments_api():
         print(f"Error searching apartments: {e}")
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# Serialized /api/complexes payload for the currently cached complexes list
+_COMPLEXES_RESPONSE = {'source': None, 'body': None}
+
 @app.route('/api/complexes')
 def get_complexes_api():
     """Get list of residential complexes for filter"""
     try:
-        with open('data/residential_complexes.json', 'r', encoding='utf-8') as f:
-            complexes_data = json.load(f)
+        complexes_data = _get_complexes()
         
-        complexes_list = [
-            {'id': complex_item.get('id'), 'name': complex_item.get('name', '')}
-            for complex_item in complexes_data
-        ]
+        # Rebuilt only when residential_complexes.json is reloaded
+        cached = _COMPLEXES_RESPONSE
+        if cached['source'] is not complexes_data:
+            complexes_list = [
+                {'id': complex_item.get('id'), 'name': complex_item.get('name', '')}
+                for complex_item in complexes_data
+            ]
+            cached['body'] = app.json.dumps({
+                'success': True,
+                'complexes': complexes_list
+            }).encode('utf-8')
+            cached['source'] = complexes_data
         
-        return jsonify({
-            'success': True,
-            'complexes': complexes_list
-        })
+        return app.response_class(cached['body'], mimetype='application/json')
     except Exception as e:
         print(f"Error loading complexes: {e}")
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -8955,14 +9262,7 @@ def get_complexes_api():
 def get_property_details(property_id):
     """Get detailed property information"""
     try:
-        with open('data/properties_expanded.json', 'r', encoding='utf-8') as f:
-            properties_data = json.load(f)
-        
-        property_data = None
-        for prop in properties_data:
-            if str(prop.get('id')) == str(property_id):
-                property_data = prop
-                break
+        property_data = _get_property_from_json(property_id)
         
         if not property_data:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
@@ -9003,7 +9303,6 @@ def create_collection_api():
         if not manager_id:
             return jsonify({'success': False, 'error': 'Authentication required'}), 401
             
-        from models import Collection, CollectionProperty
         
         data = request.get_json()
         name = data.get('name')
@@ -9025,15 +9324,14 @@ def create_collection_api():
         db.session.add(collection)
         db.session.flush()  # Get collection ID
         
-        # Add properties to collection
-        for prop_id in property_ids:
-            collection_property = CollectionProperty(
-                collection_id=collection.id,
-                property_id=str(prop_id)
-            )
-            db.session.add(collection_property)
+        # Add properties to collection with a single multi-row INSERT
+        db.session.execute(insert(CollectionProperty), [
+            {'collection_id': collection.id, 'property_id': str(prop_id)}
+            for prop_id in property_ids
+        ])
         
         db.session.commit()
+        _invalidate_manager_widgets(manager_id)
         
         return jsonify({
             'success': True,
@@ -9072,32 +9370,30 @@ def send_collection_to_client():
         if not client or not manager:
             return jsonify({'success': False, 'error': 'Client or manager not found'}), 404
         
-        # Load property details
-        with open('data/properties_expanded.json', 'r', encoding='utf-8') as f:
-            properties_data = json.load(f)
-        
+        properties_by_id = _get_properties_cache()['by_id']
         selected_properties = []
         total_cashback = 0
         
         for prop_id in property_ids:
-            for prop in properties_data:
-                if str(prop.get('id')) == str(prop_id):
-                    price = prop.get('price', 0)
-                    cashback = int(price * 0.05)
-                    total_cashback += cashback
-                    
-                    selected_properties.append({
-                        'complex_name': prop.get('complex_name', ''),
-                        'district': prop.get('district', ''),
-                        'developer': prop.get('developer', ''),
-                        'rooms': prop.get('rooms', 0),
-                        'area': prop.get('area', 0),
-                        'price': price,
-                        'cashback': cashback,
-                        'type': prop.get('type', ''),
-                        'description': prop.get('description', '')
-                    })
-                    break
+            prop = properties_by_id.get(str(prop_id))
+            if prop is None:
+                continue
+            
+            price = prop.get('price', 0)
+            cashback = int(price * 0.05)
+            total_cashback += cashback
+            
+            selected_properties.append({
+                'complex_name': prop.get('complex_name', ''),
+                'district': prop.get('district', ''),
+                'developer': prop.get('developer', ''),
+                'rooms': prop.get('rooms', 0),
+                'area': prop.get('area', 0),
+                'price': price,
+                'cashback': cashback,
+                'type': prop.get('type', ''),
+                'description': prop.get('description', '')
+            })
         
         # Create email content
         properties_list = '\n'.join([
@@ -9155,12 +9451,27 @@ Email: {manager.email}
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+# Serialized body and ETag of /data/properties_expanded.json for the
+# current load_properties() result
+_PROPERTIES_JSON_RESPONSE = {'source': None, 'body': None, 'etag': None}
+
 @app.route('/data/properties_expanded.json')
 def properties_json():
     """Serve properties JSON data"""
     try:
         properties = load_properties()
-        return jsonify(properties)
+        
+        # load_properties() returns the same list until its cache expires,
+        # so the list is serialized once per reload, not once per request
+        cached = _PROPERTIES_JSON_RESPONSE
+        if cached['source'] is not properties:
+            body = orjson.dumps(properties, default=app.json.default, option=OrjsonProvider.option)
+            cached.update(source=properties, body=body, etag=hashlib.md5(body).hexdigest())
+        
+        response = app.response_class(cached['body'], mimetype='application/json')
+        response.set_etag(cached['etag'])
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        return response.make_conditional(request)
     except Exception as e:
         print(f"Error serving properties JSON: {e}")
         return jsonify([]), 500
@@ -9172,23 +9483,31 @@ def properties_json():
 @login_required
 def api_user_get_collections():
     """Get collections assigned to current user"""
-    from models import Collection
+    from models import Collection, CollectionProperty
+    from sqlalchemy import func
     
     try:
-        collections = Collection.query.filter_by(
-            assigned_to_user_id=current_user.id
+        # Count properties in SQL instead of loading every CollectionProperty row
+        properties_count = db.session.query(func.count(CollectionProperty.id)).filter(
+            CollectionProperty.collection_id == Collection.id
+        ).correlate(Collection).scalar_subquery()
+        
+        collections = db.session.query(Collection, properties_count).options(
+            db.selectinload(Collection.created_by)
+        ).filter(
+            Collection.assigned_to_user_id == current_user.id
         ).order_by(Collection.created_at.desc()).all()
         
         collections_data = []
-        for collection in collections:
+        for collection, collection_properties_count in collections:
             collections_data.append({
                 'id': collection.id,
                 'title': collection.title,
                 'description': collection.description,
                 'status': collection.status,
                 'created_at': collection.created_at.strftime('%d.%m.%Y'),
-                'manager_name': collection.created_by_manager.full_name if collection.created_by_manager else 'Менеджер',
-                'properties_count': len(collection.property_collections) if hasattr(collection, 'property_collections') else 0
+                'manager_name': collection.created_by.full_name if collection.created_by else 'Менеджер',
+                'properties_count': collection_properties_count
             })
         
         return jsonify({
@@ -9203,54 +9522,51 @@ def api_user_get_collections():
 @login_required
 def api_user_get_saved_searches():
     """Get saved searches for current user"""
-    from models import SavedSearch
     
     try:
-        # Get regular saved searches
-        saved_searches = SavedSearch.query.filter_by(
-            user_id=current_user.id
-        ).order_by(SavedSearch.created_at.desc()).all()
+        # Own saved searches and searches sent by managers in one round-trip:
+        # saved ones first, each group newest first
+        saved_searches = select(
+            SavedSearch.id, SavedSearch.name, SavedSearch.additional_filters.label('filters'),
+            SavedSearch.created_at.label('created_at'), SavedSearch.last_used.label('last_used'),
+            literal('saved').label('type'), literal(0).label('sort_group')
+        ).where(SavedSearch.user_id == current_user.id)
         
-        # Get sent searches from managers
-        from models import SentSearch
-        sent_searches = SentSearch.query.filter_by(
-            client_id=current_user.id
-        ).order_by(SentSearch.sent_at.desc()).all()
-        
-        searches_data = []
+        sent_searches = select(
+            SentSearch.id, SentSearch.name, SentSearch.additional_filters,
+            SentSearch.sent_at, SentSearch.applied_at,
+            literal('sent'), literal(1)
+        ).where(SentSearch.client_id == current_user.id)
         
-        # Add regular saved searches
-        for search in saved_searches:
-            filters = {}
-            if search.filters:
-                import json
-                filters = json.loads(search.filters) if isinstance(search.filters, str) else search.filters
-            
-            searches_data.append({
-                'id': search.id,
-                'name': search.name,
-                'filters': filters,
-                'created_at': search.created_at.strftime('%d.%m.%Y'),
-                'last_used': search.last_used.strftime('%d.%m.%Y') if search.last_used else None,
-                'type': 'saved'
-            })
+        searches = union_all(saved_searches, sent_searches).subquery()
+        rows = db.session.execute(
+            select(searches).order_by(searches.c.sort_group, searches.c.created_at.desc())
+        ).all()
         
-        # Add sent searches from managers
-        for search in sent_searches:
-            filters = {}
-            if search.additional_filters:
-                import json
-                filters = json.loads(search.additional_filters) if isinstance(search.additional_filters, str) else search.additional_filters
-            
-            searches_data.append({
-                'id': search.id,
-                'name': search.name,
-                'filters': filters,
-                'created_at': search.sent_at.strftime('%d.%m.%Y') if search.sent_at else 'Не указано',
-                'last_used': search.applied_at.strftime('%d.%m.%Y') if search.applied_at else None,
-                'type': 'sent',
-                'from_manager': True
-            })
+        searches_data = []
+        for search in rows:
+            filters = orjson.loads(search.filters) if search.filters else {}
+            
+            if search.type == 'saved':
+                searches_data.append({
+                    'id': search.id,
+                    'name': search.name,
+                    'filters': filters,
+                    'created_at': format_date_ru(search.created_at),
+                    'last_used': format_date_ru(search.last_used),
+                    'type': 'saved'
+                })
+            else:
+                # Sent searches from managers
+                searches_data.append({
+                    'id': search.id,
+                    'name': search.name,
+                    'filters': filters,
+                    'created_at': format_date_ru(search.created_at, 'Не указано'),
+                    'last_used': format_date_ru(search.last_used),
+                    'type': 'sent',
+                    'from_manager': True
+                })
         
         return jsonify({
             'success': True,
@@ -9264,31 +9580,63 @@ def api_user_get_saved_searches():
 @login_required
 def api_user_get_recommendations():
     """Get recommendations for current user"""
-    from models import Recommendation, SentSearch
-    from datetime import datetime
     
     try:
-        print(f"DEBUG: Loading recommendations for user ID: {current_user.id}")
+        app.logger.debug("Loading recommendations for user %s", current_user.id)
         
-        # Get traditional recommendations
-        recommendations = Recommendation.query.filter_by(
-            client_id=current_user.id
-        ).order_by(Recommendation.sent_at.desc()).all()
+        # Merge both feeds and order them in the database, then hydrate the rows.
+        # Missing dates sort as oldest; ties keep recommendations first, each by
+        # sent_at DESC with NULLs first, as the Postgres queries of the old
+        # Python merge returned them.
+        recommendations_feed = select(
+            Recommendation.id, Recommendation.created_at.label('created_at'),
+            Recommendation.sent_at.label('sent_at'), literal(0).label('sort_group')
+        ).where(Recommendation.client_id == current_user.id)
         
-        print(f"DEBUG: Found {len(recommendations)} recommendations for user {current_user.id}")
+        searches_feed = select(
+            SentSearch.id, SentSearch.sent_at, SentSearch.sent_at, literal(1)
+        ).where(SentSearch.client_id == current_user.id)
         
-        recommendations_data = []
-        for rec in recommendations:
-            rec_data = rec.to_dict()
-            rec_data['manager_name'] = f"{rec.manager.first_name} {rec.manager.last_name}" if rec.manager else 'Менеджер'
-            recommendations_data.append(rec_data)
+        feed = union_all(recommendations_feed, searches_feed).subquery()
+        page = db.session.execute(
+            select(feed.c.id, feed.c.sort_group).order_by(
+                feed.c.created_at.desc().nulls_last(), feed.c.sort_group,
+                feed.c.sent_at.desc().nulls_first()
+            )
+        ).all()
         
-        # Get sent searches from managers as recommendations  
-        sent_searches = SentSearch.query.filter_by(client_id=current_user.id).order_by(SentSearch.sent_at.desc()).all()
+        rec_ids = [row.id for row in page if row.sort_group == 0]
+        search_ids = [row.id for row in page if row.sort_group == 1]
         
-        # Convert sent searches to recommendation format
-        for search in sent_searches:
-            search_rec = {
+        # Hydrate the page rows: two primary-key IN queries on the request session
+        recommendations = {rec.id: rec for rec in Recommendation.query.options(
+            db.defer(Recommendation.item_data),
+            db.joinedload(Recommendation.manager).load_only(Manager.first_name, Manager.last_name),
+            db.joinedload(Recommendation.category).load_only(RecommendationCategory.name)
+        ).filter(Recommendation.id.in_(rec_ids))} if rec_ids else {}
+        
+        sent_searches = {search.id: search for search in SentSearch.query.options(
+            db.load_only(
+                SentSearch.name, SentSearch.description, SentSearch.status,
+                SentSearch.sent_at, SentSearch.viewed_at, SentSearch.additional_filters
+            ),
+            db.joinedload(SentSearch.manager).load_only(Manager.first_name, Manager.last_name)
+        ).filter(SentSearch.id.in_(search_ids))} if search_ids else {}
+        
+        app.logger.debug("Found %d recommendations for user %s", len(rec_ids), current_user.id)
+        
+        recommendations_data = []
+        for row in page:
+            if row.sort_group == 0:
+                rec = recommendations[row.id]
+                rec_data = rec.to_dict()
+                rec_data['manager_name'] = f"{rec.manager.first_name} {rec.manager.last_name}" if rec.manager else 'Менеджер'
+                recommendations_data.append(rec_data)
+                continue
+            
+            # Sent searches from managers in recommendation format
+            search = sent_searches[row.id]
+            recommendations_data.append({
                 'id': f'search_{search.id}',
                 'title': f'Подбор недвижимости: {search.name}',
                 'description': search.description or 'Персональный подбор от вашего менеджера',
@@ -9298,43 +9646,38 @@ def api_user_get_recommendations():
                 'manager_notes': f'Ваш менеджер {search.manager.name} подготовил персональный подбор недвижимости',
                 'priority_level': 'high',
                 'status': search.status,
-                'viewed_at': search.viewed_at.isoformat() if search.viewed_at else None,
-                'created_at': search.sent_at.isoformat() if search.sent_at else None,
-                'sent_at': search.sent_at.isoformat() if search.sent_at else None,
+                'viewed_at': search.viewed_at,
+                'created_at': search.sent_at,
+                'sent_at': search.sent_at,
                 'manager_name': search.manager.name,
                 'search_filters': search.additional_filters,
                 'search_id': search.id
-            }
-            recommendations_data.append(search_rec)
-        
-        # Sort by creation date 
-        recommendations_data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            })
         
-        return jsonify({
+        return json_response({
             'success': True, 
             'recommendations': recommendations_data
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/saved-searches/<int:search_id>')
 @login_required
 def get_saved_search_details(search_id):
     """Get saved search details for applying filters"""
-    from models import SavedSearch
     
     try:
         user_id = session.get('user_id')
         if not user_id:
-            return jsonify({'success': False, 'error': 'User not authenticated'}), 401
+            return json_response({'success': False, 'error': 'User not authenticated'}, 401)
         
         # Get the saved search
         saved_search = SavedSearch.query.filter_by(id=search_id, user_id=user_id).first()
         if not saved_search:
-            return jsonify({'success': False, 'error': 'Поиск не найден'}), 404
+            return json_response({'success': False, 'error': 'Поиск не найден'}, 404)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'id': saved_search.id,
             'name': saved_search.name,
@@ -9345,21 +9688,25 @@ def get_saved_search_details(search_id):
         
     except Exception as e:
         print(f"Error getting saved search details: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/sent-searches')
 @login_required
 def get_sent_searches():
     """Get sent searches from managers as recommendations"""
-    from models import SentSearch
     
     try:
         user_id = session.get('user_id')
         if not user_id:
-            return jsonify({'success': False, 'error': 'User not authenticated'}), 401
+            return json_response({'success': False, 'error': 'User not authenticated'}, 401)
         
         # Get sent searches
-        sent_searches = SentSearch.query.filter_by(client_id=user_id).order_by(SentSearch.sent_at.desc()).all()
+        sent_searches = SentSearch.query.options(
+            db.load_only(
+                SentSearch.name, SentSearch.description, SentSearch.status,
+                SentSearch.sent_at, SentSearch.additional_filters, SentSearch.manager_id
+            )
+        ).filter_by(client_id=user_id).order_by(SentSearch.sent_at.desc()).all()
         
         # Format as recommendation-like objects
         search_list = []
@@ -9371,116 +9718,121 @@ def get_sent_searches():
                 'title': search.name or 'Поиск от менеджера',
                 'description': search.description,
                 'status': search.status or 'sent',
-                'sent_at': search.sent_at.isoformat() if search.sent_at else None,
-                'created_at': search.sent_at.isoformat() if search.sent_at else None,
+                'sent_at': search.sent_at,
+                'created_at': search.sent_at,
                 'search_filters': search.additional_filters,
                 'manager_id': search.manager_id,
                 'recommendation_type': 'search'
             })
         
-        return jsonify({
+        return json_response({
             'success': True,
             'sent_searches': search_list
         })
         
     except Exception as e:
         print(f"Error getting sent searches: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
+
+def _parse_rec_id(rec_id):
+    """Split a feed item id into ('search', SentSearch id) or ('rec', Recommendation id)"""
+    if rec_id.startswith('search_'):
+        return 'search', int(rec_id[7:])
+    return 'rec', int(rec_id)
+
+def _client_has_item(model, item_id):
+    """Whether the Recommendation/SentSearch row exists and belongs to current_user"""
+    return db.session.query(
+        model.query.filter_by(id=item_id, client_id=current_user.id).exists()
+    ).scalar()
 
 @app.route('/api/recommendations/<rec_id>/viewed', methods=['POST'])
 @login_required  
 def api_mark_recommendation_viewed(rec_id):
     """Mark recommendation as viewed"""
-    from models import Recommendation, SentSearch
-    from datetime import datetime
     
     try:
-        # Handle search recommendations
-        if str(rec_id).startswith('search_'):
-            search_id = int(rec_id.replace('search_', ''))
-            sent_search = SentSearch.query.filter_by(
-                id=search_id, 
-                client_id=current_user.id
-            ).first()
-            
-            if not sent_search:
-                return jsonify({'success': False, 'error': 'Поиск не найден'}), 404
-                
-            if sent_search.status == 'sent':
-                sent_search.status = 'viewed'
-                sent_search.viewed_at = datetime.utcnow()
-                db.session.commit()
-            
-            return jsonify({'success': True})
+        kind, item_id = _parse_rec_id(rec_id)
         
-        # Handle traditional recommendations
-        recommendation = Recommendation.query.filter_by(
-            id=int(rec_id), 
-            client_id=current_user.id
-        ).first()
+        # Handle search recommendations
+        if kind == 'search':
+            model, not_found = SentSearch, 'Поиск не найден'
+        else:
+            model, not_found = Recommendation, 'Рекомендация не найдена'
+        
+        # Only 'sent' items move to 'viewed'; the row is not loaded into the session
+        result = db.session.execute(
+            update(model)
+            .where(model.id == item_id, model.client_id == current_user.id, model.status == 'sent')
+            .values(status='viewed', viewed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            # Nothing to write: already viewed, or not this client's item
+            found = _client_has_item(model, item_id)
+            db.session.rollback()
+            if not found:
+                return json_response({'success': False, 'error': not_found}, 404)
+            return json_response({'success': True})
         
-        if not recommendation:
-            return jsonify({'success': False, 'error': 'Рекомендация не найдена'}), 404
-            
-        if recommendation.status == 'sent':
-            recommendation.status = 'viewed'
-            recommendation.viewed_at = datetime.utcnow()
-            db.session.commit()
+        db.session.commit()
         
-        return jsonify({'success': True})
+        return json_response({'success': True})
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/recommendations/<int:rec_id>/dismiss', methods=['POST'])
 @login_required
 def api_dismiss_recommendation(rec_id):
     """Dismiss/hide recommendation"""
-    from models import Recommendation
-    from datetime import datetime
     
     try:
-        recommendation = Recommendation.query.filter_by(
-            id=rec_id, 
-            client_id=current_user.id
-        ).first()
+        # Mark as dismissed; repeated dismissals write nothing
+        result = db.session.execute(
+            update(Recommendation)
+            .where(
+                Recommendation.id == rec_id,
+                Recommendation.client_id == current_user.id,
+                Recommendation.status.is_distinct_from('dismissed')
+            )
+            .values(status='dismissed', viewed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            found = _client_has_item(Recommendation, rec_id)
+            db.session.rollback()
+            if not found:
+                return json_response({'success': False, 'error': 'Рекомендация не найдена'}, 404)
+            return json_response({'success': True})
         
-        if not recommendation:
-            return jsonify({'success': False, 'error': 'Рекомендация не найдена'}), 404
-            
-        # Mark as dismissed
-        recommendation.status = 'dismissed'
-        recommendation.viewed_at = datetime.utcnow()
         db.session.commit()
         
-        return jsonify({'success': True})
+        return json_response({'success': True})
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/recommendations/<rec_id>/apply', methods=['POST'])
 @login_required  
 def api_apply_search_recommendation(rec_id):
     """Apply search recommendation - redirect to properties with filters"""
-    from models import SentSearch
-    from datetime import datetime
-    import json
     
     try:
         # Handle search recommendations only
-        if not str(rec_id).startswith('search_'):
-            return jsonify({'success': False, 'error': 'Только поиски можно применить'}), 400
-            
-        search_id = int(rec_id.replace('search_', ''))
+        kind, search_id = _parse_rec_id(rec_id)
+        if kind != 'search':
+            return json_response({'success': False, 'error': 'Только поиски можно применить'}, 400)
+        
         sent_search = SentSearch.query.filter_by(
             id=search_id, 
             client_id=current_user.id
         ).first()
         
         if not sent_search:
-            return jsonify({'success': False, 'error': 'Поиск не найден'}), 404
+            return json_response({'success': False, 'error': 'Поиск не найден'}, 404)
         
         # Update search status
         sent_search.applied_at = datetime.utcnow()
@@ -9489,32 +9841,51 @@ def api_apply_search_recommendation(rec_id):
         db.session.commit()
         
         # Parse filters from the search
-        filters = {}
-        if sent_search.additional_filters:
-            try:
-                filters = json.loads(sent_search.additional_filters)
-            except json.JSONDecodeError:
-                pass
+        try:
+            filters = sent_search.filters_dict
+        except orjson.JSONDecodeError:
+            filters = {}
         
-        return jsonify({
+        return json_response({
             'success': True, 
             'filters': filters
         })
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
+
+# Recommendation category listings: (kind, owner ids..., version) -> (expires_at, body).
+# Category writes bump the version, so a listing built from a read that raced
+# the write is never served afterwards; the TTL bounds staleness for writes
+# made by other workers.
+CATEGORIES_CACHE_TTL = 60
+_CATEGORIES_CACHE = JsonResponseCache(CATEGORIES_CACHE_TTL)
+
+def _invalidate_categories_cache():
+    """Call after committing any RecommendationCategory change"""
+    _CATEGORIES_CACHE.bump()
 
 @app.route('/api/user/recommendation-categories', methods=['GET'])
 @login_required
 def api_user_get_categories():
     """Get all categories that have recommendations for current user"""
-    from models import RecommendationCategory
+    
+    cache_key = ('client', current_user.id, _CATEGORIES_CACHE.version)
+    cached = _CATEGORIES_CACHE.get(cache_key)
+    if cached:
+        return cached
     
     try:
-        categories = RecommendationCategory.query.filter_by(
-            client_id=current_user.id
-        ).filter(RecommendationCategory.recommendations_count > 0).all()
+        categories = db.session.execute(
+            select(
+                RecommendationCategory.id, RecommendationCategory.name, RecommendationCategory.description,
+                RecommendationCategory.color, RecommendationCategory.recommendations_count
+            ).where(
+                RecommendationCategory.client_id == current_user.id,
+                RecommendationCategory.recommendations_count > 0
+            )
+        ).all()
         
         categories_data = []
         for category in categories:
@@ -9526,48 +9897,61 @@ def api_user_get_categories():
                 'recommendations_count': category.recommendations_count
             })
         
-        return jsonify({
+        return _CATEGORIES_CACHE.store(cache_key, json_response({
             'success': True,
             'categories': categories_data
-        })
+        }))
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
+
+# Notifications are sent off the request thread so SMTP round-trips don't hold up responses
+_notification_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='notifications')
+
+def send_notification_async(*args, **kwargs):
+    """Queue email_service.send_notification() on the background pool"""
+    def send():
+        with app.app_context():
+            try:
+                send_notification(*args, **kwargs)
+            except Exception as e:
+                print(f"Error sending notification: {e}")
+    return _notification_executor.submit(send)
 
 @app.route('/api/recommendations/<int:rec_id>/respond', methods=['POST'])
 @login_required
 def api_respond_to_recommendation(rec_id):
     """Client responds to recommendation with interest/not interested"""
-    from models import Recommendation
-    from datetime import datetime
     
     try:
         data = request.get_json()
         response_type = data.get('response')  # 'interested' or 'not_interested'
         
         if response_type not in ['interested', 'not_interested']:
-            return jsonify({'success': False, 'error': 'Неверный тип ответа'}), 400
-            
-        recommendation = Recommendation.query.filter_by(
-            id=rec_id,
-            client_id=current_user.id
+            return json_response({'success': False, 'error': 'Неверный тип ответа'}, 400)
+            
+        # RETURNING hands back what the notification needs without a separate SELECT
+        recommendation = db.session.execute(
+            update(Recommendation)
+            .where(Recommendation.id == rec_id, Recommendation.client_id == current_user.id)
+            .values(status=response_type, client_response=response_type, responded_at=datetime.utcnow())
+            .returning(Recommendation.title, Recommendation.item_name, Recommendation.manager_id)
+            .execution_options(synchronize_session=False)
         ).first()
         
         if not recommendation:
-            return jsonify({'success': False, 'error': 'Рекомендация не найдена'}), 404
-            
-        recommendation.status = response_type
-        recommendation.client_response = response_type
-        recommendation.responded_at = datetime.utcnow()
+            db.session.rollback()
+            return json_response({'success': False, 'error': 'Рекомендация не найдена'}, 404)
         
         db.session.commit()
         
         # Notify manager about client response
-        if recommendation.manager:
-            try:
-                from email_service import send_notification
-                subject = f"Ответ клиента на рекомендацию: {recommendation.title}"
-                message = f"""
+        manager_email = db.session.execute(
+            select(Manager.email).where(Manager.id == recommendation.manager_id)
+        ).scalar()
+        if manager_email:
+            subject = f"Ответ клиента на рекомендацию: {recommendation.title}"
+            message = f"""
 Клиент {current_user.full_name} ответил на вашу рекомендацию:
 
 Рекомендация: {recommendation.title}
@@ -9576,36 +9960,35 @@ def api_respond_to_recommendation(rec_id):
 
 Время ответа: {datetime.now().strftime('%d.%m.%Y %H:%M')}
 """
-                send_notification(
-                    recommendation.manager.email,
-                    subject,
-                    message,
-                    notification_type="client_response"
-                )
-            except Exception as e:
-                print(f"Error sending notification to manager: {e}")
+            send_notification_async(
+                manager_email,
+                subject,
+                message,
+                notification_type="client_response"
+            )
         
-        return jsonify({'success': True})
+        return json_response({'success': True})
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/manager/clients', methods=['GET'])
 def api_manager_get_clients():
     """Get list of clients for manager"""
-    from models import User
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
     
     try:
-        # Get all clients (buyers)
-        clients = User.query.filter_by(
-            role='buyer'
-        ).order_by(User.full_name).all()
+        # Get all clients (buyers), only the columns the list shows
+        clients = db.session.execute(
+            select(User.id, User.email, User.full_name, User.phone, User.created_at, User.client_status)
+            .where(User.role == 'buyer')
+            .order_by(User.full_name)
+        ).all()
         
         clients_data = []
         for client in clients:
@@ -9614,34 +9997,44 @@ def api_manager_get_clients():
                 'email': client.email,
                 'full_name': client.full_name,
                 'phone': client.phone,
-                'created_at': client.created_at.strftime('%d.%m.%Y') if client.created_at else '',
-                'client_status': getattr(client, 'client_status', 'Новый')
+                'created_at': format_date_ru(client.created_at, ''),
+                'client_status': client.client_status
             })
         
-        return jsonify({
+        return json_response({
             'success': True,
             'clients': clients_data
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/manager/recommendation-categories/<int:client_id>', methods=['GET'])
 def api_get_recommendation_categories(client_id):
     """Get recommendation categories for a specific client"""
-    from models import RecommendationCategory
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
-    
-    try:
-        categories = RecommendationCategory.query.filter_by(
-            manager_id=manager_id,
-            client_id=client_id,
-            is_active=True
-        ).order_by(RecommendationCategory.last_used.desc()).all()
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
+    
+    cache_key = ('manager_client', manager_id, client_id, _CATEGORIES_CACHE.version)
+    cached = _CATEGORIES_CACHE.get(cache_key)
+    if cached:
+        return cached
+    
+    try:
+        categories = db.session.execute(
+            select(
+                RecommendationCategory.id, RecommendationCategory.name, RecommendationCategory.description,
+                RecommendationCategory.color, RecommendationCategory.recommendations_count,
+                RecommendationCategory.last_used, RecommendationCategory.created_at
+            ).where(
+                RecommendationCategory.manager_id == manager_id,
+                RecommendationCategory.client_id == client_id,
+                RecommendationCategory.is_active == True
+            ).order_by(RecommendationCategory.last_used.desc())
+        ).all()
         
         categories_data = []
         for category in categories:
@@ -9651,27 +10044,26 @@ def api_get_recommendation_categories(client_id):
                 'description': category.description,
                 'color': category.color,
                 'recommendations_count': category.recommendations_count,
-                'last_used': category.last_used.strftime('%d.%m.%Y') if category.last_used else '',
-                'created_at': category.created_at.strftime('%d.%m.%Y') if category.created_at else ''
+                'last_used': format_date_ru(category.last_used, ''),
+                'created_at': format_date_ru(category.created_at, '')
             })
         
-        return jsonify({
+        return _CATEGORIES_CACHE.store(cache_key, json_response({
             'success': True,
             'categories': categories_data
-        })
+        }))
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/manager/recommendation-categories', methods=['POST'])
 def api_create_recommendation_category():
     """Create new recommendation category"""
-    from models import RecommendationCategory
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
     
     try:
         data = request.get_json()
@@ -9681,7 +10073,7 @@ def api_create_recommendation_category():
         color = data.get('color', 'blue')
         
         if not category_name or not client_id:
-            return jsonify({'success': False, 'error': 'Название категории и клиент обязательны'}), 400
+            return json_response({'success': False, 'error': 'Название категории и клиент обязательны'}, 400)
         
         # Check if category with this name already exists for this client
         existing = RecommendationCategory.query.filter_by(
@@ -9692,7 +10084,7 @@ def api_create_recommendation_category():
         ).first()
         
         if existing:
-            return jsonify({'success': False, 'error': 'Категория с таким названием уже существует'}), 400
+            return json_response({'success': False, 'error': 'Категория с таким названием уже существует'}, 400)
         
         # Create new category
         category = RecommendationCategory(
@@ -9705,8 +10097,9 @@ def api_create_recommendation_category():
         
         db.session.add(category)
         db.session.commit()
+        _invalidate_categories_cache()
         
-        return jsonify({
+        return json_response({
             'success': True,
             'category': {
                 'id': category.id,
@@ -9720,67 +10113,73 @@ def api_create_recommendation_category():
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
 
 @app.route('/api/manager/all-categories', methods=['GET'])
 def api_manager_all_categories():
     """Get all categories created by this manager"""
-    from models import RecommendationCategory, User
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
-    
-    try:
-        categories = db.session.query(
-            RecommendationCategory, 
-            User.email.label('client_email')
-        ).outerjoin(
-            User, RecommendationCategory.client_id == User.id
-        ).filter(
-            RecommendationCategory.manager_id == manager_id
-        ).order_by(
-            RecommendationCategory.last_used.desc().nulls_last(),
-            RecommendationCategory.created_at.desc()
-        ).all()
-        
-        category_data = []
-        for category, client_email in categories:
-            category_data.append({
-                'id': category.id,
-                'name': category.name,
-                'description': category.description,
-                'client_email': client_email or 'Общая категория',
-                'recommendations_count': category.recommendations_count,
-                'is_active': category.is_active,
-                'last_used': category.last_used.isoformat() if category.last_used else None,
-                'created_at': category.created_at.isoformat()
-            })
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
+    
+    cache_key = ('manager', manager_id, _CATEGORIES_CACHE.version)
+    cached = _CATEGORIES_CACHE.get(cache_key)
+    if cached:
+        return cached
+    
+    try:
+        # Plain column rows streamed in batches, no ORM entities in the identity map
+        categories = db.session.execute(
+            select(
+                RecommendationCategory.id, RecommendationCategory.name, RecommendationCategory.description,
+                User.email.label('client_email'), RecommendationCategory.recommendations_count,
+                RecommendationCategory.is_active, RecommendationCategory.last_used,
+                RecommendationCategory.created_at
+            ).outerjoin(
+                User, RecommendationCategory.client_id == User.id
+            ).where(
+                RecommendationCategory.manager_id == manager_id
+            ).order_by(
+                RecommendationCategory.last_used.desc().nulls_last(),
+                RecommendationCategory.created_at.desc()
+            ).execution_options(yield_per=500)
+        )
         
-        return jsonify({
+        category_data = [{
+            'id': category.id,
+            'name': category.name,
+            'description': category.description,
+            'client_email': category.client_email or 'Общая категория',
+            'recommendations_count': category.recommendations_count,
+            'is_active': category.is_active,
+            'last_used': category.last_used,
+            'created_at': category.created_at
+        } for category in categories]
+        
+        return _CATEGORIES_CACHE.store(cache_key, json_response({
             'success': True,
             'categories': category_data
-        })
+        }))
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/manager/categories/global', methods=['POST'])
 def api_manager_create_global_category():
     """Create a new global category template"""
-    from models import RecommendationCategory
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
     
     data = request.get_json()
     name = data.get('name', '').strip()
     description = data.get('description', '').strip()
     
     if not name:
-        return jsonify({'success': False, 'error': 'Укажите название категории'}), 400
+        return json_response({'success': False, 'error': 'Укажите название категории'}, 400)
     
     try:
         # Create a template category without specific client
@@ -9795,8 +10194,9 @@ def api_manager_create_global_category():
         
         db.session.add(category)
         db.session.commit()
+        _invalidate_categories_cache()
         
-        return jsonify({
+        return json_response({
             'success': True,
             'category': {
                 'id': category.id,
@@ -9806,17 +10206,16 @@ def api_manager_create_global_category():
         })
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/manager/categories/<int:category_id>/toggle', methods=['POST'])
 def api_manager_toggle_category(category_id):
     """Toggle category active status"""
-    from models import RecommendationCategory
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
     
     data = request.get_json()
     is_active = data.get('is_active', True)
@@ -9828,67 +10227,81 @@ def api_manager_toggle_category(category_id):
         ).first()
         
         if not category:
-            return jsonify({'success': False, 'error': 'Категория не найдена'}), 404
+            return json_response({'success': False, 'error': 'Категория не найдена'}, 404)
         
         category.is_active = is_active
         db.session.commit()
+        _invalidate_categories_cache()
         
-        return jsonify({'success': True})
+        return json_response({'success': True})
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 # Manager Dashboard API endpoints
+
+# Welcome message bodies per manager: (manager_id, hour) -> (expires_at, body).
+# The greeting depends on the hour, so a cached body is only reused within it.
+# Entries are dropped by _invalidate_manager_widgets() like the dashboard ones.
+WELCOME_MESSAGE_TTL = 60
+_WELCOME_MESSAGE_CACHE = JsonResponseCache(WELCOME_MESSAGE_TTL)
+
 @app.route('/api/manager/welcome-message', methods=['GET'])
 @manager_required
 def api_manager_welcome_message():
     """Get adaptive welcome message based on recent activity"""
-    from models import User, Recommendation, Collection, SavedSearch, Manager
-    from sqlalchemy import func, desc
-    from datetime import datetime, timedelta
     
     manager_id = session.get('manager_id')
+    now = datetime.now()
+    
+    cache_key = (manager_id, now.hour)
+    cached = _WELCOME_MESSAGE_CACHE.get(cache_key)
+    if cached:
+        return cached
+    
     current_manager = Manager.query.get(manager_id)
     
     if not current_manager:
-        return jsonify({'success': False, 'error': 'Менеджер не найден'}), 404
+        return json_response({'success': False, 'error': 'Менеджер не найден'}, 404)
     
     try:
-        now = datetime.now()
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         week_start = today_start - timedelta(days=7)
         
-        # Get recent activity counts
-        recent_recommendations = Recommendation.query.filter(
-            Recommendation.manager_id == manager_id,
-            Recommendation.created_at >= week_start
-        ).count()
-        
-        today_recommendations = Recommendation.query.filter(
-            Recommendation.manager_id == manager_id,
-            Recommendation.created_at >= today_start
-        ).count()
-        
-        recent_collections = Collection.query.filter(
-            Collection.created_by_manager_id == manager_id,
-            Collection.created_at >= week_start
-        ).count()
-        
-        total_clients = User.query.filter_by(assigned_manager_id=manager_id).count()
+        # Get recent activity counts and latest activity dates in one round-trip
+        recommendation_stats = select(
+            func.count().filter(Recommendation.created_at >= week_start).label('recent_recommendations'),
+            func.count().filter(Recommendation.created_at >= today_start).label('today_recommendations'),
+            func.max(Recommendation.created_at).label('latest_recommendation_at')
+        ).where(Recommendation.manager_id == manager_id).subquery()
+        
+        collection_stats = select(
+            func.count().filter(Collection.created_at >= week_start).label('recent_collections'),
+            func.max(Collection.created_at).label('latest_collection_at')
+        ).where(Collection.created_by_manager_id == manager_id).subquery()
+        
+        client_stats = select(
+            func.count().label('total_clients'),
+            func.count().filter(User.created_at >= today_start).label('new_clients_today')
+        ).where(User.assigned_manager_id == manager_id).subquery()
+        
+        # Each aggregate yields exactly one row, so the joins just line them up
+        activity = db.session.execute(
+            select(recommendation_stats, collection_stats, client_stats).select_from(
+                recommendation_stats.join(collection_stats, true()).join(client_stats, true())
+            )
+        ).one()
         
-        new_clients_today = User.query.filter(
-            User.assigned_manager_id == manager_id,
-            User.created_at >= today_start
-        ).count()
+        recent_recommendations = activity.recent_recommendations
+        today_recommendations = activity.today_recommendations
+        recent_collections = activity.recent_collections
+        total_clients = activity.total_clients
+        new_clients_today = activity.new_clients_today
         
         # Get last activity time (use created_at if last_login_at doesn't exist)
         last_activity = getattr(current_manager, 'last_login_at', None) or current_manager.created_at
         hours_since_last_login = (now - last_activity).total_seconds() / 3600 if last_activity else 0
         
-        # Get most recent activity
-        latest_recommendation = Recommendation.query.filter_by(manager_id=manager_id).order_by(desc(Recommendation.created_at)).first()
-        latest_collection = Collection.query.filter_by(created_by_manager_id=manager_id).order_by(desc(Collection.created_at)).first()
-        
         # Generate adaptive message based on activity patterns
         messages = []
         
@@ -9943,11 +10356,11 @@ def api_manager_welcome_message():
             'needs_attention': total_clients > 0 and recent_recommendations == 0,
             'high_activity': recent_recommendations >= 5 or recent_collections >= 3,
             'new_day': hours_since_last_login >= 8,
-            'latest_recommendation_date': latest_recommendation.created_at.strftime('%d.%m.%Y') if latest_recommendation else None,
-            'latest_collection_date': latest_collection.created_at.strftime('%d.%m.%Y') if latest_collection else None
+            'latest_recommendation_date': activity.latest_recommendation_at.strftime('%d.%m.%Y') if activity.latest_recommendation_at else None,
+            'latest_collection_date': activity.latest_collection_at.strftime('%d.%m.%Y') if activity.latest_collection_at else None
         }
         
-        return jsonify({
+        return _WELCOME_MESSAGE_CACHE.store(cache_key, json_response({
             'success': True,
             'messages': messages,
             'context': activity_context,
@@ -9958,11 +10371,11 @@ def api_manager_welcome_message():
                 'total_clients': total_clients,
                 'new_clients_today': new_clients_today
             }
-        })
+        }))
         
     except Exception as e:
         print(f"Error generating welcome message: {e}")
-        return jsonify({
+        return json_response({
             'success': True,
             'messages': [f"{time_greeting}, {first_name}!", "Панель управления менеджера недвижимости"],
             'context': {'has_recent_activity': False},
@@ -9972,33 +10385,34 @@ def api_manager_welcome_message():
 @app.route('/api/manager/dashboard-stats', methods=['GET'])
 def api_manager_dashboard_stats():
     """Get manager dashboard statistics"""
-    from models import User, Recommendation
-    from sqlalchemy import func
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
-        return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
+        return json_response({'success': False, 'error': 'Требуется авторизация менеджера'}, 401)
     
     try:
-        # Count clients assigned to this manager
-        clients_count = User.query.filter_by(assigned_manager_id=manager_id).count()
-        
-        # Count recommendations sent by this manager
-        recommendations_count = Recommendation.query.filter_by(manager_id=manager_id).count()
-        
-        # Count recommendations sent this month
-        from datetime import datetime
         month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_recommendations = Recommendation.query.filter(
-            Recommendation.manager_id == manager_id,
-            Recommendation.sent_at >= month_start
-        ).count()
+        
+        # Clients assigned to this manager, recommendations sent in total and this month
+        stats = db.session.execute(select(
+            select(func.count()).select_from(User).where(
+                User.assigned_manager_id == manager_id
+            ).scalar_subquery().label('clients_count'),
+            select(func.count()).select_from(Recommendation).where(
+                Recommendation.manager_id == manager_id
+            ).scalar_subquery().label('recommendations_count'),
+            select(func.count()).select_from(Recommendation).where(
+                Recommendation.manager_id == manager_id,
+                Recommendation.sent_at >= month_start
+            ).scalar_subquery().label('monthly_recommendations')
+        )).one()
+        clients_count, recommendations_count, monthly_recommendations = stats
         
         # Collections count (placeholder for now)
         collections_count = 5
         
-        return jsonify({
+        return json_response({
             'success': True,
             'clients_count': clients_count,
             'recommendations_count': monthly_recommendations,
@@ -10007,39 +10421,59 @@ def api_manager_dashboard_stats():
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return json_response({'success': False, 'error': str(e)}, 400)
+
+# Manager dashboard widgets: (widget, manager_id) -> (expires_at, body). The
+# dashboard polls these; a manager's entries are dropped when they create or
+# delete a recommendation or create a collection, and the TTL bounds staleness
+# for other writers.
+MANAGER_DASHBOARD_CACHE_TTL = 20
+_MANAGER_DASHBOARD_CACHE = JsonResponseCache(MANAGER_DASHBOARD_CACHE_TTL)
+
+def _invalidate_manager_widgets(manager_id):
+    """Call after committing a Recommendation insert/delete or a Collection insert for manager_id"""
+    for widget in ('activity_feed', 'top_clients'):
+        _MANAGER_DASHBOARD_CACHE.pop((widget, manager_id))
+    _WELCOME_MESSAGE_CACHE.pop((manager_id, datetime.now().hour))
+
+def _time_ago(delta):
+    """Short Russian "N ago" label for a timedelta, from its total seconds"""
+    seconds = max(int(delta.total_seconds()), 0)
+    if seconds >= 86400:
+        return f"{seconds // 86400} дн. назад"
+    if seconds >= 3600:
+        return f"{seconds // 3600} ч. назад"
+    return f"{seconds // 60} мин. назад"
 
 @app.route('/api/manager/activity-feed', methods=['GET'])
 def api_manager_activity_feed():
     """Get manager activity feed"""
-    from models import Recommendation, User
-    from datetime import datetime, timedelta
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
         return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
     
+    cache_key = ('activity_feed', manager_id)
+    cached = _MANAGER_DASHBOARD_CACHE.get(cache_key)
+    if cached:
+        return cached
+    
     try:
         # Get recent activities (recommendations sent)
-        recent_recommendations = Recommendation.query.filter_by(
+        recent_recommendations = Recommendation.query.options(
+            db.joinedload(Recommendation.client).load_only(User.full_name)
+        ).filter_by(
             manager_id=manager_id
         ).order_by(Recommendation.sent_at.desc()).limit(10).all()
         
         activities = []
+        now = datetime.utcnow()
         for rec in recent_recommendations:
-            time_diff = datetime.utcnow() - rec.sent_at
-            if time_diff.days > 0:
-                time_ago = f"{time_diff.days} дн. назад"
-            elif time_diff.seconds > 3600:
-                time_ago = f"{time_diff.seconds // 3600} ч. назад"
-            else:
-                time_ago = f"{time_diff.seconds // 60} мин. назад"
-            
             activities.append({
                 'title': f'Отправлена рекомендация',
                 'description': f'{rec.title} для {rec.client.full_name}',
-                'time_ago': time_ago,
+                'time_ago': _time_ago(now - rec.sent_at),
                 'icon': 'paper-plane',
                 'color': 'blue'
             })
@@ -10063,10 +10497,10 @@ def api_manager_activity_feed():
                 }
             ])
         
-        return jsonify({
+        return _MANAGER_DASHBOARD_CACHE.store(cache_key, jsonify({
             'success': True,
             'activities': activities
-        })
+        }))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -10074,34 +10508,36 @@ def api_manager_activity_feed():
 @app.route('/api/manager/top-clients', methods=['GET'])
 def api_manager_top_clients():
     """Get top clients by interactions"""
-    from models import User, Recommendation
-    from sqlalchemy import func
     
     # Check if user is authenticated as manager
     manager_id = session.get('manager_id')
     if not manager_id:
         return jsonify({'success': False, 'error': 'Требуется авторизация менеджера'}), 401
     
+    cache_key = ('top_clients', manager_id)
+    cached = _MANAGER_DASHBOARD_CACHE.get(cache_key)
+    if cached:
+        return cached
+    
     try:
         # Get clients with most interactions (recommendations received)
-        top_clients = db.session.query(
-            User,
-            func.count(Recommendation.id).label('interactions_count')
-        ).join(
-            Recommendation, User.id == Recommendation.client_id
-        ).filter(
-            Recommendation.manager_id == manager_id
-        ).group_by(User.id).order_by(
-            func.count(Recommendation.id).desc()
-        ).limit(5).all()
+        interactions_count = func.count(Recommendation.id).label('interactions_count')
+        top_clients = db.session.execute(
+            select(User.id, User.full_name, User.email, interactions_count)
+            .join(Recommendation, User.id == Recommendation.client_id)
+            .where(Recommendation.manager_id == manager_id)
+            .group_by(User.id, User.full_name, User.email)
+            .order_by(interactions_count.desc())
+            .limit(5)
+        ).all()
         
         clients_data = []
-        for user, count in top_clients:
+        for client in top_clients:
             clients_data.append({
-                'id': user.id,
-                'full_name': user.full_name,
-                'email': user.email,
-                'interactions_count': count
+                'id': client.id,
+                'full_name': client.full_name,
+                'email': client.email,
+                'interactions_count': client.interactions_count
             })
         
         # Add demo clients if not enough data
@@ -10113,20 +10549,26 @@ def api_manager_top_clients():
             ]
             clients_data.extend(demo_clients[:3-len(clients_data)])
         
-        return jsonify({
+        return _MANAGER_DASHBOARD_CACHE.store(cache_key, jsonify({
             'success': True,
             'clients': clients_data
-        })
+        }))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+def blog_text_search(model, search):
+    """Title/content search: GIN-indexed full-text match on Postgres, LIKE elsewhere"""
+    if db.engine.dialect.name == 'postgresql':
+        return blog_search_document(model.title, model.content).op('@@')(
+            func.plainto_tsquery(literal_column("'russian'"), search))
+    return model.title.contains(search) | model.content.contains(search)
+
 # Blog Management Routes for Managers
 @app.route('/admin/blog-manager')
 @manager_required
 def admin_blog_manager():
     """Manager blog management page"""
-    from models import BlogArticle, BlogCategory
     
     try:
         # Get filter parameters
@@ -10138,8 +10580,7 @@ def admin_blog_manager():
         query = BlogArticle.query
         
         if search:
-            query = query.filter(BlogArticle.title.contains(search) | 
-                               BlogArticle.content.contains(search))
+            query = query.filter(blog_text_search(BlogArticle, search))
         
         if status:
             query = query.filter(BlogArticle.status == status)
@@ -10147,8 +10588,15 @@ def admin_blog_manager():
         if category_id:
             query = query.filter(BlogArticle.category_id == int(category_id))
         
-        # Order by creation date
-        articles = query.order_by(BlogArticle.created_at.desc()).all()
+        # Order by creation date, one page at a time; content isn't rendered in the list
+        page = request.args.get('page', 1, type=int)
+        articles = query.options(
+            db.load_only(BlogArticle.id, BlogArticle.title, BlogArticle.slug, BlogArticle.excerpt,
+                         BlogArticle.status, BlogArticle.is_featured, BlogArticle.views_count,
+                         BlogArticle.category_id, BlogArticle.created_at, BlogArticle.published_at),
+            db.joinedload(BlogArticle.category),
+            db.raiseload('*')  # anything else the template touches would be a per-row query
+        ).order_by(BlogArticle.created_at.desc()).paginate(page=page, per_page=25, error_out=False)
         
         # Get categories for filter dropdown
         categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all()
@@ -10169,9 +10617,6 @@ def admin_blog_manager():
 @manager_required
 def admin_create_new_article():
     """Create new blog article"""
-    from models import BlogCategory, BlogArticle
-    import re
-    from datetime import datetime
     
     if request.method == 'GET':
         categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all()
@@ -10187,15 +10632,7 @@ def admin_create_new_article():
         is_featured = 'is_featured' in request.form
         
         # Generate slug from title
-        slug = re.sub(r'[^\w\s-]', '', (title or '').lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure slug is unique
-        original_slug = slug
-        counter = 1
-        while BlogArticle.query.filter_by(slug=slug).first():
-            slug = f"{original_slug}-{counter}"
-            counter += 1
+        slug = slugify(title or '')
         
         # Create article
         article = BlogArticle(
@@ -10214,11 +10651,12 @@ def admin_create_new_article():
             article.published_at = datetime.utcnow()
         
         # Calculate reading time (approx 200 words per minute)
-        word_count = len(content.split()) if content else 0
+        word_count = count_words(content)
         article.reading_time = max(1, word_count // 200)
         
-        db.session.add(article)
+        add_with_unique_slug(article, slug)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Статья успешно создана!', 'success')
         return redirect(url_for('admin_blog_manager'))
@@ -10233,9 +10671,6 @@ def admin_create_new_article():
 @manager_required 
 def admin_edit_new_article(article_id):
     """Edit existing blog article"""
-    from models import BlogArticle, BlogCategory
-    import re
-    from datetime import datetime
     
     article = BlogArticle.query.get_or_404(article_id)
     
@@ -10254,15 +10689,10 @@ def admin_edit_new_article(article_id):
         
         # Update slug if title changed
         if title != article.title:
-            slug = re.sub(r'[^\w\s-]', '', (title or '').lower())
-            slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+            slug = slugify(title or '')
             
             # Ensure slug is unique (exclude current article)
-            original_slug = slug
-            counter = 1
-            while BlogArticle.query.filter_by(slug=slug).filter(BlogArticle.id != article_id).first():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
+            slug = unique_slug(BlogArticle, slug, exclude_id=article_id)
             
             article.slug = slug
         
@@ -10280,10 +10710,11 @@ def admin_edit_new_article(article_id):
             article.published_at = datetime.utcnow()
         
         # Recalculate reading time
-        word_count = len(content.split()) if content else 0
+        word_count = count_words(content)
         article.reading_time = max(1, word_count // 200)
         
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Статья успешно обновлена!', 'success')
         return redirect(url_for('admin_blog_manager'))
@@ -10298,12 +10729,12 @@ def admin_edit_new_article(article_id):
 @manager_required
 def admin_delete_new_article(article_id):
     """Delete blog article"""
-    from models import BlogArticle
     
     try:
         article = BlogArticle.query.get_or_404(article_id)
         db.session.delete(article)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Статья успешно удалена!', 'success')
         
@@ -10318,7 +10749,6 @@ def admin_delete_new_article(article_id):
 @admin_required
 def admin_blog_categories():
     """Manage blog categories"""
-    from models import Admin, BlogCategory
     
     admin_id = session.get('admin_id')
     current_admin = Admin.query.get(admin_id)
@@ -10331,8 +10761,6 @@ def admin_blog_categories():
 @admin_required
 def admin_create_category():
     """Create new blog category - both form and JSON API"""
-    from models import Admin, BlogCategory
-    import re
     
     admin_id = session.get('admin_id')
     current_admin = Admin.query.get(admin_id)
@@ -10348,25 +10776,7 @@ def admin_create_category():
                 return jsonify({'success': False, 'error': 'Название категории обязательно'})
             
             # Generate slug from Russian name
-            def transliterate(text):
-                rus_to_eng = {
-                    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z',
-                    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
-                    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
-                    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
-                }
-                return ''.join(rus_to_eng.get(char.lower(), char) for char in text)
-            
-            slug = transliterate(name.lower())
-            slug = re.sub(r'[^\w\s-]', '', slug)
-            slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-            
-            # Ensure unique slug
-            original_slug = slug
-            counter = 1
-            while BlogCategory.query.filter_by(slug=slug).first():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
+            slug = translit_slug(name)
             
             category = BlogCategory(
                 name=name,
@@ -10375,8 +10785,9 @@ def admin_create_category():
                 is_active=True
             )
             
-            db.session.add(category)
+            add_with_unique_slug(category, slug)
             db.session.commit()
+            _invalidate_blog_list_cache()
             
             return jsonify({
                 'success': True,
@@ -10404,15 +10815,7 @@ def admin_create_category():
         description = request.form.get('description', '')
         
         # Generate slug
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure unique slug
-        original_slug = slug
-        counter = 1
-        while BlogCategory.query.filter_by(slug=slug).first():
-            slug = f"{original_slug}-{counter}"
-            counter += 1
+        slug = slugify(name)
         
         category = BlogCategory(
             name=name,
@@ -10420,8 +10823,9 @@ def admin_create_category():
             description=description
         )
         
-        db.session.add(category)
+        add_with_unique_slug(category, slug)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash(f'Категория "{name}" успешно создана!', 'success')
         return redirect(url_for('admin_blog'))
@@ -10432,29 +10836,155 @@ def admin_create_category():
         return render_template('admin/blog_category_create.html', admin=current_admin)
 
 
+# Published blog listings change rarely; keep the loaded rows for a short while.
+# Header/session parts of the page still render per request, so cache rows, not HTML.
+BLOG_LIST_CACHE_TTL = 60
+_BLOG_LIST_CACHE = {}
+_blog_list_cache_version = 0
+_blog_list_cache_lock = threading.Lock()
+
+def _merge_cached_rows(value):
+    if isinstance(value, list):
+        return [db.session.merge(obj, load=False) for obj in value]
+    return db.session.merge(value, load=False) if value is not None else None
+
+def _detach_cached_rows(value, seen=None):
+    """Expunge loaded rows and their loaded related rows from the session.
+
+    Cached rows are shared between request threads, so no session may keep
+    owning them (expiring them on commit, autoflushing, refreshing)."""
+    seen = set() if seen is None else seen
+    for obj in (value if isinstance(value, list) else [value]):
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        state = db.inspect(obj)
+        if state.session is not None:
+            state.session.expunge(obj)
+        for relationship in state.mapper.relationships:
+            related = state.dict.get(relationship.key)
+            if related is not None:
+                _detach_cached_rows(list(related) if relationship.uselist else related, seen)
+
+def _cached_blog_listing(key, loader):
+    """loader() result from the listing cache; cached ORM rows are re-attached without SQL.
+
+    loader must eager-load every attribute the template reads: the rows are
+    detached from the loading session before they are cached, and each later
+    request merges its own copies (the cached objects themselves are only read)."""
+    version = _blog_list_cache_version
+    cached = _BLOG_LIST_CACHE.get(key)
+    if cached and cached[0] > time.time() and cached[1] == version:
+        return tuple(_merge_cached_rows(value) for value in cached[2])
+    result = loader()
+    for value in result:
+        _detach_cached_rows(value)
+    if len(_BLOG_LIST_CACHE) >= 256:
+        _BLOG_LIST_CACHE.clear()
+    _BLOG_LIST_CACHE[key] = (time.time() + BLOG_LIST_CACHE_TTL, version, result)
+    return result
+
+def _cached_anonymous_page(render):
+    """Rendered HTML shared by visitors with an empty session (no login, city choice or flashes).
+
+    A remember-me cookie means Flask-Login will restore a login on this
+    request, so such visitors are rendered individually too. The cached
+    views read no query arguments, so pages are keyed by path; they are kept
+    alongside the listing rows and dropped by the same invalidation."""
+    if session or app.config.get('REMEMBER_COOKIE_NAME', 'remember_token') in request.cookies:
+        return render()
+    key = ('page', request.path)
+    version = _blog_list_cache_version
+    cached = _BLOG_LIST_CACHE.get(key)
+    if cached and cached[0] > time.time() and cached[1] == version:
+        return cached[2]
+    html = render()
+    if len(_BLOG_LIST_CACHE) >= 256:
+        _BLOG_LIST_CACHE.clear()
+    _BLOG_LIST_CACHE[key] = (time.time() + BLOG_LIST_CACHE_TTL, version, html)
+    return html
+
+def _invalidate_blog_list_cache():
+    """Call after committing any BlogArticle/BlogCategory change"""
+    global _blog_list_cache_version
+    with _blog_list_cache_lock:
+        _blog_list_cache_version += 1
+        _BLOG_LIST_CACHE.clear()
+
+# BlogArticle views are summed in memory and added in one UPDATE every
+# ARTICLE_VIEWS_FLUSH_INTERVAL seconds instead of a commit per page view
+ARTICLE_VIEWS_FLUSH_INTERVAL = 30
+_ARTICLE_VIEWS_QUEUE = {}
+_ARTICLE_VIEWS_LOCK = threading.Lock()
+_article_views_flusher = None
+
+def _queue_article_view(article_id):
+    """Count one view, starting the flusher thread on first use"""
+    global _article_views_flusher
+    with _ARTICLE_VIEWS_LOCK:
+        _ARTICLE_VIEWS_QUEUE[article_id] = _ARTICLE_VIEWS_QUEUE.get(article_id, 0) + 1
+        if _article_views_flusher is None:
+            _article_views_flusher = threading.Thread(target=_article_views_flush_loop, daemon=True)
+            _article_views_flusher.start()
+
+def _flush_article_views():
+    """Add all pending view deltas with a single UPDATE ... CASE"""
+    with _ARTICLE_VIEWS_LOCK:
+        pending = dict(_ARTICLE_VIEWS_QUEUE)
+        _ARTICLE_VIEWS_QUEUE.clear()
+    if not pending:
+        return
+    
+    with app.app_context():
+        try:
+            db.session.execute(
+                update(BlogArticle)
+                .where(BlogArticle.id.in_(pending))
+                .values(views_count=func.coalesce(BlogArticle.views_count, 0) + case(pending, value=BlogArticle.id))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error flushing blog article views: {e}")
+
+def _article_views_flush_loop():
+    while True:
+        time.sleep(ARTICLE_VIEWS_FLUSH_INTERVAL)
+        _flush_article_views()
+
+atexit.register(_flush_article_views)
+
 # Blog Public Routes  
 @app.route('/blog-new')
 def blog_new():
     """Public blog page"""
-    from models import BlogArticle, BlogCategory
     
     try:
         # Get published articles
-        articles = BlogArticle.query.filter_by(status='published').order_by(BlogArticle.published_at.desc()).all()
-        categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all()
-        
-        # Add pagination variables that template expects
-        return render_template('blog.html', 
-                             articles=articles, 
-                             categories=categories,
-                             total_pages=1,
-                             current_page=1,
-                             has_prev=False,
-                             has_next=False,
-                             prev_num=None,
-                             next_num=None,
-                             search_query='',
-                             category_filter=None)
+        def load_index():
+            articles = BlogArticle.query.options(db.joinedload(BlogArticle.category)).filter_by(
+                status='published').order_by(BlogArticle.published_at.desc()).all()
+            categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all()
+            return articles, categories
+        
+        def render():
+            articles, categories = _cached_blog_listing('index', load_index)
+            
+            # Add pagination variables that template expects
+            return render_template('blog.html', 
+                                 articles=articles, 
+                                 categories=categories,
+                                 total_pages=1,
+                                 current_page=1,
+                                 has_prev=False,
+                                 has_next=False,
+                                 prev_num=None,
+                                 next_num=None,
+                                 search_query='',
+                                 category_filter=None)
+        
+        return _cached_anonymous_page(render)
         
     except Exception as e:
         print(f"Blog error: {str(e)}")
@@ -10470,14 +11000,12 @@ def blog_new():
 @app.route('/blog-new/<slug>')
 def blog_article_new(slug):
     """View single blog article"""
-    from models import BlogArticle
     
     try:
         article = BlogArticle.query.filter_by(slug=slug, status='published').first_or_404()
         
-        # Increment view count
-        article.views_count += 1
-        db.session.commit()
+        # Count the view; written to the DB by the background flusher
+        _queue_article_view(article.id)
         
         # Get related articles from same category
         related_articles = BlogArticle.query.filter_by(
@@ -10501,89 +11029,138 @@ def blog_article_new(slug):
 @app.route('/blog-new/category/<slug>')
 def blog_category_new(slug):
     """View articles by category"""
-    from models import BlogCategory, BlogArticle
     
     try:
-        category = BlogCategory.query.filter_by(slug=slug, is_active=True).first_or_404()
-        
-        articles = BlogArticle.query.filter_by(
-            category_id=category.id,
-            status='published'
-        ).order_by(
-            BlogArticle.published_at.desc()
-        ).all()
+        def load_category():
+            category = BlogCategory.query.filter_by(slug=slug, is_active=True).first()
+            if not category:
+                return None, []
+            articles = BlogArticle.query.options(db.joinedload(BlogArticle.author)).filter_by(
+                category_id=category.id,
+                status='published'
+            ).order_by(
+                BlogArticle.published_at.desc()
+            ).all()
+            return category, articles
+        
+        def render():
+            category, articles = _cached_blog_listing(('category', slug), load_category)
+            if not category:
+                abort(404)
+            
+            return render_template('blog_category.html', 
+                                 category=category,
+                                 articles=articles)
         
-        return render_template('blog_category.html', 
-                             category=category,
-                             articles=articles)
+        return _cached_anonymous_page(render)
         
     except Exception as e:
         flash('Категория не найдена', 'error')
         return redirect(url_for('blog_new'))
 
 
-@app.route('/blog/<slug>')
-def blog_post(slug):
-    """Display single blog post by slug"""
-    try:
-        # Find post by slug - using direct SQL query
-        from sqlalchemy import text
-        result = db.session.execute(text("""
-            SELECT id, title, slug, content, excerpt, category, featured_image, 
-                   views_count, created_at, '' as author_name
-            FROM blog_posts 
+def _blog_post_dict(row):
+    return {
+        'id': row[0],
+        'title': row[1],
+        'slug': row[2],
+        'content': row[3],
+        'excerpt': row[4],
+        'category': row[5],
+        'featured_image': row[6],
+        'views_count': row[7] or 0,
+        'created_at': row[8],
+        'author_name': row[9] or 'InBack'
+    }
+
+_BLOG_RELATED_KEYS = ('id', 'title', 'slug', 'excerpt', 'featured_image', 'created_at')
+
+def _count_and_load_blog_post_pg(slug):
+    """Postgres: count the view and fetch the post with its related posts in one round-trip.
+
+    The lateral join yields one row with NULL related columns when there are none.
+    """
+    rows = db.session.execute(text("""
+        WITH post AS (
+            UPDATE blog_posts 
+            SET views_count = COALESCE(views_count, 0) + 1 
             WHERE slug = :slug AND status = 'published'
-        """), {'slug': slug}).fetchone()
-        
-        if not result:
-            flash('Статья не найдена', 'error')
-            return redirect(url_for('blog'))
-        
-        # Convert to dict for template
-        post = {
-            'id': result[0],
-            'title': result[1],
-            'slug': result[2],
-            'content': result[3],
-            'excerpt': result[4],
-            'category': result[5],
-            'featured_image': result[6],
-            'views_count': result[7] or 0,
-            'created_at': result[8],
-            'author_name': result[9] or 'InBack'
-        }
-        
-        # Increment view count
+            RETURNING id, title, slug, content, excerpt, category, featured_image, 
+                      views_count, created_at
+        )
+        SELECT post.id, post.title, post.slug, post.content, post.excerpt, post.category,
+               post.featured_image, post.views_count, post.created_at, '' as author_name,
+               r.id, r.title, r.slug, r.excerpt, r.featured_image, r.created_at
+        FROM post
+        LEFT JOIN LATERAL (
+            SELECT id, title, slug, excerpt, featured_image, created_at
+            FROM blog_posts
+            WHERE category = post.category AND status = 'published' AND id != post.id
+            ORDER BY created_at DESC
+            LIMIT 3
+        ) r ON true
+    """), {'slug': slug}).fetchall()
+    db.session.commit()
+    if not rows:
+        return None, []
+    return _blog_post_dict(rows[0]), [dict(zip(_BLOG_RELATED_KEYS, r[10:])) for r in rows if r[10] is not None]
+
+def _load_blog_post(slug, count_view=True):
+    """Portable path: read the post, count the view, then read its related posts.
+
+    A failed view increment is rolled back and never blocks rendering the post.
+    """
+    posts = BlogPost.__table__
+    result = db.session.execute(
+        select(posts.c.id, posts.c.title, posts.c.slug, posts.c.content, posts.c.excerpt,
+               posts.c.category, posts.c.featured_image, posts.c.views_count,
+               posts.c.created_at, literal('').label('author_name'))
+        .where(posts.c.slug == slug, posts.c.status == 'published')
+    ).first()
+    if not result:
+        return None, []
+    post = _blog_post_dict(result)
+    
+    if count_view:
         try:
-            db.session.execute(text("""
-                UPDATE blog_posts 
-                SET views_count = COALESCE(views_count, 0) + 1 
-                WHERE id = :id
-            """), {'id': post['id']})
+            db.session.execute(
+                update(posts)
+                .where(posts.c.id == post['id'])
+                .values(views_count=func.coalesce(posts.c.views_count, 0) + 1)
+            )
             db.session.commit()
             post['views_count'] += 1
         except Exception as e:
             db.session.rollback()
+            print(f"Error counting blog post view: {e}")
+    
+    related_results = db.session.execute(
+        select(*(posts.c[key] for key in _BLOG_RELATED_KEYS))
+        .where(posts.c.category == post['category'], posts.c.status == 'published',
+               posts.c.id != post['id'])
+        .order_by(posts.c.created_at.desc())
+        .limit(3)
+    ).all()
+    return post, [dict(zip(_BLOG_RELATED_KEYS, r)) for r in related_results]
+
+@app.route('/blog/<slug>')
+def blog_post(slug):
+    """Display single blog post by slug"""
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            try:
+                post, related_posts = _count_and_load_blog_post_pg(slug)
+            except Exception as e:
+                # The view counter must not take the page down; read without counting
+                db.session.rollback()
+                print(f"Error counting blog post view: {e}")
+                post, related_posts = _load_blog_post(slug, count_view=False)
+        else:
+            post, related_posts = _load_blog_post(slug)
         
-        # Get related posts from same category
-        related_results = db.session.execute(text("""
-            SELECT id, title, slug, excerpt, featured_image, created_at
-            FROM blog_posts 
-            WHERE category = :category AND status = 'published' AND id != :id
-            ORDER BY created_at DESC
-            LIMIT 3
-        """), {'category': post['category'], 'id': post['id']}).fetchall()
-        
-        related_posts = []
-        for r in related_results:
-            related_posts.append({
-                'id': r[0],
-                'title': r[1], 
-                'slug': r[2],
-                'excerpt': r[3],
-                'featured_image': r[4],
-                'created_at': r[5]
-            })
+        if post is None:
+            flash('Статья не найдена', 'error')
+            return redirect(url_for('blog'))
         
         return render_template('blog_post.html', 
                              post=post,
@@ -10599,7 +11176,6 @@ def blog_post(slug):
 @admin_required
 def admin_blog_management():
     """Admin blog management page"""
-    from models import BlogPost, BlogCategory
     
     try:
         # Get filter parameters
@@ -10612,8 +11188,7 @@ def admin_blog_management():
         query = BlogPost.query
         
         if search:
-            query = query.filter(BlogPost.title.contains(search) | 
-                               BlogPost.content.contains(search))
+            query = query.filter(blog_text_search(BlogPost, search))
         
         if status:
             query = query.filter(BlogPost.status == status)
@@ -10621,8 +11196,12 @@ def admin_blog_management():
         if category_name:
             query = query.filter(BlogPost.category == category_name)
         
-        # Order by creation date and paginate
-        posts = query.order_by(BlogPost.created_at.desc()).paginate(
+        # Order by creation date and paginate; the list never renders the post body
+        posts = query.options(
+            db.load_only(BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.excerpt, BlogPost.status,
+                         BlogPost.category, BlogPost.views_count, BlogPost.created_at, BlogPost.published_at),
+            db.raiseload('*')
+        ).order_by(BlogPost.created_at.desc()).paginate(
             page=page, per_page=10, error_out=False
         )
         
@@ -10630,7 +11209,6 @@ def admin_blog_management():
         categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.name).all()
         
         # Get admin user for template
-        from flask_login import current_user
         admin = current_user if current_user.is_authenticated else None
         
         return render_template('admin/blog_management.html',
@@ -10650,9 +11228,6 @@ def admin_blog_management():
 @admin_required
 def admin_create_blog_post():
     """Create new blog post"""
-    from models import BlogPost, BlogCategory
-    import re
-    from datetime import datetime
     
     if request.method == 'GET':
         categories = BlogCategory.query.order_by(BlogCategory.name).all()
@@ -10678,18 +11253,10 @@ def admin_create_blog_post():
             return redirect(url_for('admin_create_blog_post'))
         
         # Generate slug from title
-        slug = re.sub(r'[^\w\s-]', '', (title or '').lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure slug is unique
-        original_slug = slug
-        counter = 1
-        while BlogPost.query.filter_by(slug=slug).first():
-            slug = f"{original_slug}-{counter}"
-            counter += 1
+        slug = slugify(title or '')
         
         # Calculate reading time (approx 200 words per minute)
-        word_count = len(content.split()) if content else 0
+        word_count = count_words(content)
         reading_time = max(1, word_count // 200)
         
         # Create blog post using BlogPost model
@@ -10708,15 +11275,11 @@ def admin_create_blog_post():
         if status == 'published':
             post.published_at = datetime.utcnow()
         
-        db.session.add(post)
-        db.session.commit()
-        
-        # Обновим счетчик статей в категории
-        category.articles_count = BlogPost.query.filter_by(category=category.name, status='published').count()
+        add_with_unique_slug(post, slug)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         print(f'DEBUG: Created article "{title}" in category "{category.name}" with status "{status}"')
-        print(f'DEBUG: Updated category "{category.name}" article count to {category.articles_count}')
         
         flash('Статья успешно создана!', 'success')
         return redirect(url_for('admin_blog_management'))
@@ -10740,18 +11303,14 @@ def admin_upload_image():
     
     # Check if file is an image
     allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-    if not (file.filename and '.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+    ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+    if ext not in allowed_extensions:
         return jsonify({'success': False, 'error': 'Разрешены только изображения (PNG, JPG, JPEG, GIF, WebP)'}), 400
     
     try:
-        # Generate secure filename
-        filename = secure_filename(file.filename) if file.filename else 'unnamed_file'
-        
-        # Add timestamp to avoid naming conflicts
-        import time
-        timestamp = str(int(time.time()))
-        name, ext = os.path.splitext(filename)
-        filename = f"{name}_{timestamp}{ext}"
+        # Random name so concurrent uploads never collide; the extension
+        # comes from the allowlist check above
+        filename = f"{secrets.token_hex(16)}.{ext}"
         
         # Save file
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
@@ -10776,9 +11335,6 @@ def admin_upload_image():
 @admin_required
 def admin_edit_blog_post(post_id):
     """Edit blog post"""
-    from models import BlogPost, BlogCategory
-    import re
-    from datetime import datetime
     
     post = BlogPost.query.get_or_404(post_id)
     
@@ -10820,23 +11376,17 @@ def admin_edit_blog_post(post_id):
         
         # Update slug if title changed
         if title != post.title:
-            slug = re.sub(r'[^\w\s-]', '', (title or '').lower())
-            slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+            slug = slugify(title or '')
             
-            original_slug = slug
-            counter = 1
-            while BlogPost.query.filter_by(slug=slug).filter(BlogPost.id != post_id).first():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
+            slug = unique_slug(BlogPost, slug, exclude_id=post_id)
             
             post.slug = slug
         
         # Calculate reading time
-        word_count = len(content.split()) if content else 0
+        word_count = count_words(content)
         reading_time = max(1, word_count // 200)
         
         # Update post
-        old_category = post.category
         post.title = title
         post.excerpt = excerpt
         post.content = content
@@ -10854,15 +11404,7 @@ def admin_edit_blog_post(post_id):
             post.published_at = datetime.utcnow()
         
         db.session.commit()
-        
-        # Update category article counts for both old and new categories
-        for cat_name in [old_category, category.name]:
-            if cat_name:
-                cat = BlogCategory.query.filter_by(name=cat_name).first()
-                if cat:
-                    cat.articles_count = BlogPost.query.filter_by(category=cat_name, status='published').count()
-        
-        db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Статья успешно обновлена!', 'success')
         return redirect(url_for('admin_blog_management'))
@@ -10877,21 +11419,13 @@ def admin_edit_blog_post(post_id):
 @admin_required
 def admin_delete_blog_post(post_id):
     """Delete blog post"""
-    from models import BlogPost, BlogCategory
     
     try:
         post = BlogPost.query.get_or_404(post_id)
-        category_name = post.category
         
         db.session.delete(post)
         db.session.commit()
-        
-        # Update category article count
-        if category_name:
-            category = BlogCategory.query.filter_by(name=category_name).first()
-            if category:
-                category.articles_count = BlogPost.query.filter_by(category=category_name, status='published').count()
-                db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Статья успешно удалена!', 'success')
         
@@ -10906,10 +11440,17 @@ def admin_delete_blog_post(post_id):
 @admin_required
 def admin_blog_categories_management():
     """Admin blog categories management"""
-    from models import BlogCategory
     
     try:
-        categories = BlogCategory.query.order_by(BlogCategory.sort_order).all()
+        # articles_count is kept current by the blog_posts counter, so no per-row
+        # counts are needed; plain column rows, no ORM entities or relationships
+        categories = db.session.execute(
+            select(
+                BlogCategory.id, BlogCategory.name, BlogCategory.slug, BlogCategory.description,
+                BlogCategory.color, BlogCategory.icon, BlogCategory.articles_count,
+                BlogCategory.is_active, BlogCategory.sort_order
+            ).order_by(BlogCategory.sort_order)
+        ).all()
         return render_template('admin/blog_categories.html', categories=categories)
         
     except Exception as e:
@@ -10921,8 +11462,6 @@ def admin_blog_categories_management():
 @admin_required
 def admin_create_blog_category_new():
     """Create blog category"""
-    from models import BlogCategory
-    import re
     
     if request.method == 'GET':
         return render_template('admin/blog_category_create.html')
@@ -10936,15 +11475,7 @@ def admin_create_blog_category_new():
         sort_order = request.form.get('sort_order', 0, type=int)
         
         # Generate slug
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure slug is unique
-        original_slug = slug
-        counter = 1
-        while BlogCategory.query.filter_by(slug=slug).first():
-            slug = f"{original_slug}-{counter}"
-            counter += 1
+        slug = slugify(name)
         
         category = BlogCategory(
             name=name,
@@ -10957,8 +11488,9 @@ def admin_create_blog_category_new():
             articles_count=0
         )
         
-        db.session.add(category)
+        add_with_unique_slug(category, slug)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Категория успешно создана!', 'success')
         return redirect(url_for('admin_blog_categories_management'))
@@ -10973,8 +11505,6 @@ def admin_create_blog_category_new():
 @admin_required  
 def admin_edit_blog_category_new(category_id):
     """Edit blog category"""
-    from models import BlogCategory
-    import re
     
     category = BlogCategory.query.get_or_404(category_id)
     
@@ -10992,14 +11522,9 @@ def admin_edit_blog_category_new(category_id):
         
         # Update slug if name changed
         if name != category.name:
-            slug = re.sub(r'[^\w\s-]', '', name.lower())
-            slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+            slug = slugify(name)
             
-            original_slug = slug
-            counter = 1
-            while BlogCategory.query.filter_by(slug=slug).filter(BlogCategory.id != category_id).first():
-                slug = f"{original_slug}-{counter}"
-                counter += 1
+            slug = unique_slug(BlogCategory, slug, exclude_id=category_id)
             
             category.slug = slug
         
@@ -11011,6 +11536,7 @@ def admin_edit_blog_category_new(category_id):
         category.is_active = is_active
         
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Категория успешно обновлена!', 'success')
         return redirect(url_for('admin_blog_categories_management'))
@@ -11025,7 +11551,6 @@ def admin_edit_blog_category_new(category_id):
 @admin_required
 def admin_delete_blog_category_new(category_id):
     """Delete blog category"""
-    from models import BlogCategory, BlogArticle
     
     try:
         category = BlogCategory.query.get_or_404(category_id)
@@ -11038,6 +11563,7 @@ def admin_delete_blog_category_new(category_id):
         
         db.session.delete(category)
         db.session.commit()
+        _invalidate_blog_list_cache()
         
         flash('Категория успешно удалена!', 'success')
         
@@ -11127,107 +11653,122 @@ def smart_suggestions_api():
         print(f"ERROR: Smart suggestions failed: {e}")
         return jsonify({'suggestions': []})
 
+# Columnar view of the load_properties() list for apply_smart_filters, rebuilt
+# whenever load_properties() hands out a new list
+_SMART_FILTER_COLUMNS = {'source': None}
+
+def _smart_filter_title(prop):
+    rooms, area = prop.get('rooms', 0), prop.get('area', 0)
+    return f"{rooms}-комн {area} м²" if (rooms or 0) > 0 else f"Студия {area} м²"
+
+def _build_smart_filter_columns(properties):
+    """Inverted indexes (value -> set of row positions) and a price column.
+    
+    Text fields are indexed lowercased, so keyword matching is a dict lookup for
+    exact fields and a scan over distinct values (not properties) for substrings.
+    """
+    index = {field: defaultdict(set) for field in ('rooms', 'district', 'type', 'class', 'wall', 'features', 'title')}
+    for i, prop in enumerate(properties):
+        index['rooms'][str(prop.get('rooms', ''))].add(i)
+        index['district'][prop.get('district', '')].add(i)
+        index['type'][prop.get('property_type', 'Квартира').lower()].add(i)
+        index['class'][prop.get('property_class', '').lower()].add(i)
+        index['wall'][prop.get('wall_material', '').lower()].add(i)
+        for feature in prop.get('features', []):
+            index['features'][feature.lower()].add(i)
+        index['title'][_smart_filter_title(prop).lower()].add(i)
+    return {
+        'source': properties,
+        'index': {field: dict(values) for field, values in index.items()},
+        'prices': np.array([prop.get('price', 0) or 0 for prop in properties], dtype=np.float64),
+    }
+
+def _smart_filter_columns(properties):
+    global _SMART_FILTER_COLUMNS
+    if _SMART_FILTER_COLUMNS['source'] is not properties:
+        _SMART_FILTER_COLUMNS = _build_smart_filter_columns(properties)
+    return _SMART_FILTER_COLUMNS
+
+def _rows_containing(index, needle):
+    """Positions whose indexed text contains needle"""
+    return set().union(*(positions for value, positions in index.items() if needle in value))
+
+def _keep_rows(rows, matched):
+    """rows (in order) whose position is in the matched set"""
+    return rows[np.fromiter((i in matched for i in rows.tolist()), dtype=bool, count=len(rows))]
+
+def _first_by_key(rows, keys, k):
+    """The first k rows of a stable sort by keys, in that order, partitioning
+    first so that only the kept rows are sorted"""
+    if k < len(rows):
+        cutoff = np.partition(keys, k - 1)[k - 1]
+        keep = keys < cutoff
+        # Ties at the cutoff go to the earliest rows, as in the stable sort
+        keep[np.flatnonzero(keys == cutoff)[:k - np.count_nonzero(keep)]] = True
+        rows, keys = rows[keep], keys[keep]
+    return rows[np.argsort(keys, kind='stable')]
+
 def apply_smart_filters(properties, criteria):
     """Применяет умные фильтры на основе критериев OpenAI"""
-    filtered = properties.copy()
+    columns = _smart_filter_columns(properties)
+    index, prices = columns['index'], columns['prices']
+    # Positions in properties that are still in the result, in list order
+    rows = np.arange(len(properties))
     
     # Фильтр по комнатам
     if criteria.get('rooms'):
-        rooms_list = criteria['rooms']
-        filtered = [p for p in filtered if str(p.get('rooms', '')) in rooms_list]
+        rows = _keep_rows(rows, set().union(*(index['rooms'].get(r, ()) for r in criteria['rooms'])))
     
     # Фильтр по району
     if criteria.get('district'):
-        district = criteria['district']
-        filtered = [p for p in filtered if p.get('district', '') == district]
+        rows = _keep_rows(rows, index['district'].get(criteria['district'], set()))
     
     # Фильтр по ключевым словам (типы недвижимости, классы, материалы)
     if criteria.get('keywords'):
-        keywords_filtered = []
-        for prop in filtered:
-            prop_matches = False
-            for keyword in criteria['keywords']:
-                keyword_lower = keyword.lower()
-                
-                # Тип недвижимости
-                prop_type_lower = prop.get('property_type', 'Квартира').lower()
-                if keyword_lower == prop_type_lower:
-                    prop_matches = True
-                    break
-                
-                # Класс недвижимости (точное совпадение)
-                prop_class_lower = prop.get('property_class', '').lower()
-                if keyword_lower == prop_class_lower:
-                    prop_matches = True
-                    break
-                
-                # Материал стен
-                wall_material_lower = prop.get('wall_material', '').lower()
-                if keyword_lower in wall_material_lower:
-                    prop_matches = True
-                    break
-                
-                # Особенности
-                features = prop.get('features', [])
-                if any(keyword_lower in feature.lower() for feature in features):
-                    prop_matches = True
-                    break
-                
-                # Особая логика для ценовых категорий
-                if keyword_lower == 'дорого' or keyword_lower == 'недорого':
-                    # Эти ключевые слова обрабатываются отдельно после фильтрации
-                    continue
-                
-                # Поиск в заголовке как fallback
-                property_title = f"{prop.get('rooms', 0)}-комн {prop.get('area', 0)} м²" if prop.get('rooms', 0) > 0 else f"Студия {prop.get('area', 0)} м²"
-                title_lower = property_title.lower()
-                if keyword_lower in title_lower:
-                    prop_matches = True
-                    break
-            
-            if prop_matches:
-                keywords_filtered.append(prop)
-        
-        filtered = keywords_filtered
+        matched = set()
+        for keyword in criteria['keywords']:
+            keyword_lower = keyword.lower()
+            # Тип недвижимости и класс (точное совпадение)
+            matched |= index['type'].get(keyword_lower, set())
+            matched |= index['class'].get(keyword_lower, set())
+            # Материал стен и особенности
+            matched |= _rows_containing(index['wall'], keyword_lower)
+            matched |= _rows_containing(index['features'], keyword_lower)
+            # Поиск в заголовке как fallback; ценовые категории обрабатываются
+            # отдельно после фильтрации
+            if keyword_lower not in ('дорого', 'недорого'):
+                matched |= _rows_containing(index['title'], keyword_lower)
+        rows = _keep_rows(rows, matched)
         
         # Обработка ценовых ключевых слов после основной фильтрации
+        # (equal prices keep their list order)
         if 'дорого' in criteria.get('keywords', []):
-            # Сортируем по цене и берем верхние 50%
-            filtered = sorted(filtered, key=lambda x: x.get('price', 0), reverse=True)
-            filtered = filtered[:max(1, len(filtered)//2)]
+            # Верхние 50% по цене, от дорогих к дешёвым
+            rows = _first_by_key(rows, -prices[rows], max(1, len(rows)//2))
         elif 'недорого' in criteria.get('keywords', []):
-            # Сортируем по цене и берем нижние 50%
-            filtered = sorted(filtered, key=lambda x: x.get('price', 0))
-            filtered = filtered[:max(1, len(filtered)//2)]
+            # Нижние 50% по цене, от дешёвых к дорогим
+            rows = _first_by_key(rows, prices[rows], max(1, len(rows)//2))
     
     # Фильтр по особенностям
     if criteria.get('features'):
-        features_list = criteria['features']
-        features_filtered = []
-        for prop in filtered:
-            prop_features = [f.lower() for f in prop.get('features', [])]
-            if any(feature.lower() in prop_features for feature in features_list):
-                features_filtered.append(prop)
-        filtered = features_filtered
+        features = index['features']
+        rows = _keep_rows(rows, set().union(*(features.get(feature.lower(), ()) for feature in criteria['features'])))
     
     # Фильтр по цене
     if criteria.get('price_range'):
         price_range = criteria['price_range']
         if len(price_range) >= 1 and price_range[0]:
-            min_price = price_range[0]
-            filtered = [p for p in filtered if p.get('price', 0) >= min_price]
+            rows = rows[prices[rows] >= price_range[0]]
         if len(price_range) >= 2 and price_range[1]:
-            max_price = price_range[1]
-            filtered = [p for p in filtered if p.get('price', 0) <= max_price]
+            rows = rows[prices[rows] <= price_range[1]]
     
-    return filtered
+    return [properties[i] for i in rows.tolist()]
 
 # Manager Client Management Routes
 @app.route('/manager/clients')
 @manager_required
 def manager_clients():
     """Manager clients page"""
-    from models import User, Manager
     
     manager_id = session.get('manager_id')
     manager = Manager.query.get(manager_id)
@@ -11242,12 +11783,72 @@ def manager_clients():
                          manager=manager,
                          clients=clients)
 
+_CLIENT_EMAIL_RE = re.compile(r'^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$')
+_CLIENT_PHONE_RE = re.compile(r'^\+7-\d{3}-\d{3}-\d{2}-\d{2}$')
+
+def _send_client_welcome(full_name, email, phone, temp_password, manager_name, login_url):
+    """Email (and SMS, if there is a phone) the login credentials of a client
+    created by a manager; runs on _notification_executor"""
+    with app.app_context():
+        try:
+            from email_service import send_email
+            
+            # Email with login credentials
+            subject = "Ваш аккаунт создан в InBack.ru - Данные для входа"
+            email_content = f"""Здравствуйте, {full_name}!
+
+Для вас создан аккаунт на платформе InBack.ru
+
+📧 Email для входа: {email}
+🔑 Временный пароль: {temp_password}
+
+🌐 Ссылка для входа: {login_url}
+
+ВАЖНО: Рекомендуем сменить пароль после первого входа в разделе "Настройки профиля"
+
+Ваш персональный менеджер: {manager_name}
+
+По всем вопросам обращайтесь к своему менеджеру.
+
+С уважением,
+Команда InBack.ru"""
+            
+            send_email(
+                to_email=email,
+                subject=subject,
+                content=email_content,
+                template_name='notification'
+            )
+            print(f"DEBUG: Welcome email with credentials sent to {email}")
+            
+            # Send SMS if phone number provided
+            if phone:
+                try:
+                    from sms_service import send_login_credentials_sms
+                    
+                    sms_sent = send_login_credentials_sms(
+                        phone=phone,
+                        email=email,
+                        password=temp_password,
+                        manager_name=manager_name,
+                        login_url=login_url
+                    )
+                    
+                    if sms_sent:
+                        print(f"DEBUG: SMS sent successfully to {phone}")
+                    else:
+                        print(f"DEBUG: SMS sending failed for {phone}")
+                    
+                except Exception as sms_e:
+                    print(f"DEBUG: Failed to send SMS: {sms_e}")
+                    
+        except Exception as e:
+            print(f"DEBUG: Failed to send welcome email: {e}")
+
 @app.route('/api/manager/add-client', methods=['POST'])
 @manager_required
 def manager_add_client():
     """Add new client"""
-    from models import User, Manager
-    import re
     
     manager_id = session.get('manager_id')
     print(f"DEBUG: Add client endpoint called by manager {manager_id}")
@@ -11277,25 +11878,16 @@ def manager_add_client():
             return jsonify({'success': False, 'error': 'Полное имя должно содержать минимум 2 символа'}), 400
         
         # Email validation
-        email_regex = r'^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$'
-        if not email or not re.match(email_regex, email):
+        if not email or not _CLIENT_EMAIL_RE.match(email):
             return jsonify({'success': False, 'error': 'Введите корректный email адрес'}), 400
         
         # Phone validation (optional but must be correct format if provided)
         if phone:
-            phone_regex = r'^\+7-\d{3}-\d{3}-\d{2}-\d{2}$'
-            if not re.match(phone_regex, phone):
+            if not _CLIENT_PHONE_RE.match(phone):
                 return jsonify({'success': False, 'error': 'Телефон должен быть в формате +7-918-123-45-67'}), 400
         
-        # Check if email already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
-            return jsonify({'success': False, 'error': 'Пользователь с таким email уже существует'}), 400
-        
-        # Generate temporary password
-        import secrets
-        import string
-        temp_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(8))
+        # Generate temporary password (8 URL-safe characters, 48 random bits)
+        temp_password = secrets.token_urlsafe(6)
         
         # Create new user with temporary password
         user = User(
@@ -11310,68 +11902,26 @@ def manager_add_client():
         )
         user.set_password(temp_password)  # Set temporary password
         
+        # The unique email index rejects duplicates, so a taken email is only
+        # looked up when the insert fails (and concurrent adds cannot both pass)
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if User.query.filter_by(email=email).first() is None:
+                raise
+            return jsonify({'success': False, 'error': 'Пользователь с таким email уже существует'}), 400
         
         print(f"DEBUG: Successfully created client {user.id}: {user.full_name}")
         
-        # Send welcome email and SMS with credentials
-        try:
-            from email_service import send_email
-            manager = Manager.query.get(manager_id)
-            manager_name = manager.full_name if manager else 'Ваш менеджер'
-            
-            # Email with login credentials
-            subject = "Ваш аккаунт создан в InBack.ru - Данные для входа"
-            email_content = f"""Здравствуйте, {full_name}!
-
-Для вас создан аккаунт на платформе InBack.ru
-
-📧 Email для входа: {email}
-🔑 Временный пароль: {temp_password}
-
-🌐 Ссылка для входа: {request.url_root.rstrip('/')}/login
-
-ВАЖНО: Рекомендуем сменить пароль после первого входа в разделе "Настройки профиля"
-
-Ваш персональный менеджер: {manager_name}
-
-По всем вопросам обращайтесь к своему менеджеру.
-
-С уважением,
-Команда InBack.ru"""
-            
-            send_email(
-                to_email=email,
-                subject=subject,
-                content=email_content,
-                template_name='notification'
-            )
-            print(f"DEBUG: Welcome email with credentials sent to {email}")
-            
-            # Send SMS if phone number provided
-            if phone:
-                try:
-                    from sms_service import send_login_credentials_sms
-                    
-                    sms_sent = send_login_credentials_sms(
-                        phone=phone,
-                        email=email,
-                        password=temp_password,
-                        manager_name=manager_name,
-                        login_url=f"{request.url_root.rstrip('/')}/login"
-                    )
-                    
-                    if sms_sent:
-                        print(f"DEBUG: SMS sent successfully to {phone}")
-                    else:
-                        print(f"DEBUG: SMS sending failed for {phone}")
-                    
-                except Exception as sms_e:
-                    print(f"DEBUG: Failed to send SMS: {sms_e}")
-                    
-        except Exception as e:
-            print(f"DEBUG: Failed to send welcome email: {e}")
+        # Send welcome email and SMS with credentials off the request thread
+        manager = Manager.query.get(manager_id)
+        manager_name = manager.full_name if manager else 'Ваш менеджер'
+        login_url = f"{request.url_root.rstrip('/')}/login"
+        _notification_executor.submit(
+            _send_client_welcome, full_name, email, phone, temp_password, manager_name, login_url
+        )
         
         return jsonify({
             'success': True, 
@@ -11383,7 +11933,7 @@ def manager_add_client():
                 'email': user.email,
                 'phone': user.phone,
                 'user_id': user.user_id,
-                'login_url': f"{request.url_root.rstrip('/')}/login",
+                'login_url': login_url,
                 'temp_password': temp_password  # Include for manager reference
             }
         })
@@ -11393,24 +11943,25 @@ def manager_add_client():
         print(f"Error adding client: {str(e)}")
         return jsonify({'success': False, 'error': f'Ошибка сервера: {str(e)}'}), 500
 
+def _manager_client_clause(client_id, manager_id):
+    """Clients a manager may manage: assigned to them, or any buyer"""
+    return (User.id == client_id) & or_(User.assigned_manager_id == manager_id, User.role == 'buyer')
+
 @app.route('/manager/get-client/<int:client_id>')
 @manager_required
 def manager_get_client(client_id):
     """Get client data for editing"""
-    from models import User
     
     try:
         manager_id = session.get('manager_id')
         print(f"DEBUG: Get client {client_id}, manager_id: {manager_id}")
         
-        # Try to find client assigned to this manager first, then any buyer
-        client = User.query.filter_by(id=client_id, assigned_manager_id=manager_id).first()
-        if not client:
-            client = User.query.filter_by(id=client_id, role='buyer').first()
+        # Primary-key lookup goes through the identity map first
+        client = db.session.get(User, client_id)
         
         print(f"DEBUG: Found client: {client}")
         
-        if not client:
+        if not client or (client.assigned_manager_id != manager_id and client.role != 'buyer'):
             return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
         
         response_data = {
@@ -11432,7 +11983,6 @@ def manager_get_client(client_id):
 @manager_required
 def manager_edit_client():
     """Edit existing client"""
-    from models import User
     
     manager_id = session.get('manager_id')
     
@@ -11445,32 +11995,34 @@ def manager_edit_client():
         
         if not client_id:
             return jsonify({'success': False, 'error': 'ID клиента не указан'}), 400
-        
-        # Try to find client assigned to this manager first, then any buyer
-        client = User.query.filter_by(id=client_id, assigned_manager_id=manager_id).first()
-        if not client:
-            client = User.query.filter_by(id=client_id, role='buyer').first()
-        
-        if not client:
-            return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
+        try:
+            client_id = int(client_id)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Некорректный ID клиента'}), 400
         
         if not all([full_name, email]):
             return jsonify({'success': False, 'error': 'Заполните обязательные поля'}), 400
         
-        # Check if email already exists (excluding current client)
-        existing_user = User.query.filter(User.email == email, User.id != client_id).first()
-        if existing_user:
+        # Update client data in one UPDATE guarded by the access check;
+        # an email taken by another user fails on the unique index
+        try:
+            updated = db.session.execute(
+                update(User)
+                .where(_manager_client_clause(client_id, manager_id))
+                .values(full_name=full_name, email=email, phone=phone, is_active=is_active,
+                        updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not updated:
+                db.session.rollback()
+                return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if User.query.filter(User.email == email, User.id != client_id).first() is None:
+                raise
             return jsonify({'success': False, 'error': 'Пользователь с таким email уже существует'}), 400
         
-        # Update client data
-        client.full_name = full_name
-        client.email = email
-        client.phone = phone
-        client.is_active = is_active
-        client.updated_at = datetime.utcnow()
-        
-        db.session.commit()
-        
         return jsonify({'success': True})
         
     except Exception as e:
@@ -11481,7 +12033,6 @@ def manager_edit_client():
 @manager_required
 def manager_delete_client():
     """Delete client"""
-    from models import User
     
     manager_id = session.get('manager_id')
     
@@ -11495,18 +12046,21 @@ def manager_delete_client():
         
         if not client_id:
             return jsonify({'success': False, 'error': 'ID клиента не указан'}), 400
-        
-        # Try to find client assigned to this manager first, then any buyer
-        client = User.query.filter_by(id=client_id, assigned_manager_id=manager_id).first()
-        if not client:
-            client = User.query.filter_by(id=client_id, role='buyer').first()
-        
-        if not client:
-            return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
+        try:
+            client_id = int(client_id)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Некорректный ID клиента'}), 400
         
         # Instead of deleting, mark as inactive
-        client.is_active = False
-        client.updated_at = datetime.utcnow()
+        updated = db.session.execute(
+            update(User)
+            .where(_manager_client_clause(client_id, manager_id))
+            .values(is_active=False, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            db.session.rollback()
+            return jsonify({'success': False, 'error': 'Клиент не найден'}), 404
         
         db.session.commit()
         
@@ -11577,7 +12131,7 @@ def send_callback_notification_telegram(callback_req, manager):
         if callback_req.budget:
             if "млн" in callback_req.budget:
                 # Extract average from range like "3-5 млн"
-                numbers = [float(x) for x in callback_req.budget.replace(" млн", "").replace("руб", "").split("-") if x.strip().replace(".", "").replace(",", "").isdigit()]
+                numbers = _budget_numbers(callback_req.budget)
                 if numbers:
                     avg_price = sum(numbers) / len(numbers) * 1000000
                     cashback = int(avg_price * 0.02)
@@ -11626,6 +12180,43 @@ def send_callback_notification_telegram(callback_req, manager):
         print(f"Error sending callback notification to Telegram: {e}")
 
 
+# On PostgreSQL blog_categories.articles_count is maintained by a row trigger
+# (installed by create_indexes.py). Other databases have no trigger, so the
+# same +/-1 deltas are applied from the ORM flush (bulk query.update()/delete()
+# on blog_posts bypasses these)
+def _bump_blog_category_count(connection, name, delta):
+    if name is None or connection.dialect.name == 'postgresql':
+        return
+    categories = BlogCategory.__table__
+    connection.execute(
+        update(categories)
+        .where(categories.c.name == name)
+        .values(articles_count=func.coalesce(categories.c.articles_count, 0) + delta)
+    )
+
+@event.listens_for(BlogPost, 'after_insert')
+def _blog_post_inserted(mapper, connection, target):
+    if target.status == 'published':
+        _bump_blog_category_count(connection, target.category, 1)
+
+@event.listens_for(BlogPost, 'after_delete')
+def _blog_post_deleted(mapper, connection, target):
+    if target.status == 'published':
+        _bump_blog_category_count(connection, target.category, -1)
+
+@event.listens_for(BlogPost, 'after_update')
+def _blog_post_updated(mapper, connection, target):
+    state = db.inspect(target)
+    status, category = state.attrs.status.history, state.attrs.category.history
+    if not (status.deleted or category.deleted):
+        return
+    old_status = status.deleted[0] if status.deleted else target.status
+    old_category = category.deleted[0] if category.deleted else target.category
+    if old_status == 'published':
+        _bump_blog_category_count(connection, old_category, -1)
+    if target.status == 'published':
+        _bump_blog_category_count(connection, target.category, 1)
+
 # Initialize database tables after all imports
 try:
     with app.app_context():
@@ -11636,76 +12227,127 @@ try:
 except Exception as e:
     print(f"Error creating database tables: {e}")
 
+_preload_json_caches()
+
+# Identical searches (popular queries, typeahead prefixes) are answered from
+# memory for BLOG_SEARCH_CACHE_TTL seconds. Keys carry the cache version.
+# BlogPost inserts/updates/deletes mark their session during flush, and the
+# version is bumped once that session commits, so a response computed from
+# data read before the commit is never served after it.
+BLOG_SEARCH_CACHE_TTL = 60
+_BLOG_SEARCH_CACHE = JsonResponseCache(BLOG_SEARCH_CACHE_TTL)
+
+def _mark_blog_search_stale(mapper, connection, target):
+    db.inspect(target).session.info['blog_search_stale'] = True
+
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(BlogPost, _event, _mark_blog_search_stale)
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_blog_search_cache(session):
+    if session.info.pop('blog_search_stale', False):
+        _BLOG_SEARCH_CACHE.bump()
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_blog_search_stale(session, previous_transaction):
+    # A savepoint rollback leaves the outer transaction (and its changes) pending
+    if not session.in_transaction():
+        session.info.pop('blog_search_stale', None)
+
+# LIKE wildcards (and the '/' escape character itself) in user-typed text
+_LIKE_SPECIAL = re.compile(r'[/%_]')
+
 @app.route('/api/blog/search')
 def blog_search_api():
     """API endpoint for instant blog search and suggestions"""
-    from models import BlogPost, BlogCategory
-    from sqlalchemy import or_, func
     
     try:
         query = request.args.get('q', '').strip()
         category = request.args.get('category', '').strip()
         suggestions_only = request.args.get('suggestions', '').lower() == 'true'
         
+        cache_key = (_BLOG_SEARCH_CACHE.version, query, category, suggestions_only)
+        cached = _BLOG_SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Start with base query - use BlogPost (where data actually is)
         search_query = BlogPost.query.filter(BlogPost.status == 'published')
         
-        # Apply search filter
-        if query:
-            search_query = search_query.filter(
-                or_(
-                    BlogPost.title.ilike(f'%{query}%'),
-                    BlogPost.content.ilike(f'%{query}%'),
-                    BlogPost.excerpt.ilike(f'%{query}%')
-                )
-            )
-        
         # Apply category filter
         if category:
             search_query = search_query.filter(BlogPost.category == category)
         
-        # For suggestions, limit to title matches only
+        # For suggestions, limit to title matches only: titles starting with
+        # the typed text (a lower(title) prefix index range scan), topped up
+        # with substring matches when there are fewer than five
         if suggestions_only:
             if query:
+                search_query = search_query.with_entities(
+                    BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.category)
+                # Typed % and _ are matched literally; both sides are lowercased in SQL
+                pattern = _LIKE_SPECIAL.sub(r'/\g<0>', query)
                 suggestions = search_query.filter(
-                    BlogPost.title.ilike(f'%{query}%')
+                    func.lower(BlogPost.title).like(func.lower(pattern).concat('%'), escape='/')
                 ).limit(5).all()
+                if len(suggestions) < 5:
+                    suggestions += search_query.filter(
+                        BlogPost.title.ilike(f'%{pattern}%', escape='/'),
+                        BlogPost.id.notin_([post_id for post_id, *_ in suggestions])
+                    ).limit(5 - len(suggestions)).all()
                 
-                return jsonify({
+                return _BLOG_SEARCH_CACHE.store(cache_key, json_response({
                     'suggestions': [{
-                        'title': post.title,
-                        'slug': post.slug,
-                        'category': post.category or 'Общее'
-                    } for post in suggestions]
-                })
+                        'title': title,
+                        'slug': slug,
+                        'category': post_category or 'Общее'
+                    } for _, title, slug, post_category in suggestions]
+                }))
             else:
-                return jsonify({'suggestions': []})
-        
-        # For full search, return formatted articles
-        articles = search_query.order_by(BlogPost.created_at.desc()).limit(20).all()
-        
-        formatted_articles = []
-        for article in articles:
-            formatted_articles.append({
-                'title': article.title,
-                'slug': article.slug,
-                'excerpt': article.excerpt or '',
-                'featured_image': article.featured_image or '',
-                'category': article.category or 'Общее',
-                'date': article.created_at.strftime('%d.%m.%Y'),
-                'reading_time': getattr(article, 'reading_time', 5),
-                'views': getattr(article, 'views', 0)
-            })
-        return jsonify({
+                return json_response({'suggestions': []})
+        
+        # For full search: indexed full-text match on title/content (ranked
+        # on Postgres), substring match on the excerpt
+        order_by = [BlogPost.created_at.desc()]
+        if query:
+            search_query = search_query.filter(
+                or_(
+                    blog_text_search(BlogPost, query),
+                    BlogPost.excerpt.ilike(f'%{query}%')
+                )
+            )
+            if db.engine.dialect.name == 'postgresql':
+                order_by.insert(0, func.ts_rank(
+                    blog_search_document(BlogPost.title, BlogPost.content),
+                    func.plainto_tsquery(literal_column("'russian'"), query)).desc())
+        
+        # Return formatted articles; only the listed columns are loaded (never content).
+        # BlogPost has no reading_time/views attributes, so those keep their defaults.
+        articles = search_query.with_entities(
+            BlogPost.title, BlogPost.slug, BlogPost.excerpt, BlogPost.featured_image,
+            BlogPost.category, BlogPost.created_at
+        ).order_by(*order_by).limit(20).all()
+        
+        formatted_articles = [{
+            'title': title,
+            'slug': slug,
+            'excerpt': excerpt or '',
+            'featured_image': featured_image or '',
+            'category': post_category or 'Общее',
+            'date': format_date_ru(created_at),
+            'reading_time': 5,
+            'views': 0
+        } for title, slug, excerpt, featured_image, post_category, created_at in articles]
+        return _BLOG_SEARCH_CACHE.store(cache_key, json_response({
             'articles': formatted_articles,
             'total': len(formatted_articles)
-        })
+        }))
         
     except Exception as e:
         print(f"ERROR in blog search API: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({'error': 'Search failed', 'articles': [], 'suggestions': []}), 500
+        return json_response({'error': 'Search failed', 'articles': [], 'suggestions': []}, 500)
 
 # Developer Scraper Management Endpoints
 @app.route('/admin/scraper')
@@ -11739,7 +12381,7 @@ def run_scraper():
         service = DeveloperParserService()
         result = service.parse_and_save_developers(limit=limit)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'stats': {
                 'developers_created': result.get('created', 0),
@@ -11756,10 +12398,10 @@ def run_scraper():
         import traceback
         traceback.print_exc()
         
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Ошибка при ИИ-парсинге: {str(e)}'
-        }), 500
+        }, 500)
 
 @app.route('/admin/scraper/test', methods=['POST'])
 @admin_required
@@ -11775,7 +12417,7 @@ def test_scraper():
             'email': 'test@example.com'
         }
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': test_data,
             'stats': {
@@ -11792,10 +12434,10 @@ def test_scraper():
         import traceback
         traceback.print_exc()
         
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Ошибка при тестировании ИИ-парсера: {str(e)}'
-        }), 500
+        }, 500)
 
 @app.route('/admin/scraper/statistics')
 @admin_required
@@ -11841,48 +12483,47 @@ def scraper_files():
             })
         
         # Sort by creation time, newest first
-        file_info.sort(key=lambda x: x['modified'], reverse=True)
+        file_info.sort(key=itemgetter('modified'), reverse=True)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'files': file_info
         })
         
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Ошибка при получении списка файлов: {str(e)}'
-        }), 500
+        }, 500)
 
 @app.route('/admin/scraper/view-file/<filename>')
 @admin_required
 def view_scraped_file(filename):
     """View scraped data file content"""
     try:
-        import json
         import os
         
         # Security check - only allow scraped files
         if not filename.startswith('scraped_developers_') or not filename.endswith('.json'):
-            return jsonify({'success': False, 'message': 'Недопустимое имя файла'}), 400
+            return json_response({'success': False, 'message': 'Недопустимое имя файла'}, 400)
         
         if not os.path.exists(filename):
-            return jsonify({'success': False, 'message': 'Файл не найден'}), 404
+            return json_response({'success': False, 'message': 'Файл не найден'}, 404)
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = orjson.loads(f.read())
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': data,
             'filename': filename
         })
         
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Ошибка при чтении файла: {str(e)}'
-        }), 500
+        }, 500)
 
 @app.route('/admin/upload-excel', methods=['POST'])
 def admin_upload_excel():
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Create the model indexes and the blog category counter trigger.
+
+db.create_all() in app.py only builds indexes together with a brand new
+table, so run this once per deploy after the models gain an index:
+
+    python create_indexes.py
+
+On PostgreSQL every index is built with CREATE INDEX CONCURRENTLY IF NOT
+EXISTS, which does not block writes to tables that already hold data.
+"""
+
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from app import app, db
+
+# blog_categories.articles_count (published BlogPosts per category name) is
+# maintained by a row trigger instead of a COUNT(*) after every post write
+BLOG_CATEGORY_COUNTER_SQL = """
+CREATE OR REPLACE FUNCTION blog_posts_bump_category_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status
+            AND OLD.category IS NOT DISTINCT FROM NEW.category THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'published' THEN
+        UPDATE blog_categories SET articles_count = COALESCE(articles_count, 0) - 1 WHERE name = OLD.category;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'published' THEN
+        UPDATE blog_categories SET articles_count = COALESCE(articles_count, 0) + 1 WHERE name = NEW.category;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS blog_posts_category_count ON blog_posts;
+
+CREATE TRIGGER blog_posts_category_count
+AFTER INSERT OR DELETE OR UPDATE OF status, category ON blog_posts
+FOR EACH ROW EXECUTE FUNCTION blog_posts_bump_category_count();
+
+UPDATE blog_categories c SET articles_count = (
+    SELECT COUNT(*) FROM blog_posts p WHERE p.category = c.name AND p.status = 'published'
+);
+"""
+
+
+def install_pg_trgm(conn):
+    """Enable pg_trgm for the blog trigram indexes; skipped if not permitted"""
+    try:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except Exception as e:
+        print(f"pg_trgm unavailable, blog trigram indexes skipped: {e}")
+
+
+def create_indexes(conn):
+    """Create every index declared on the models that does not exist yet"""
+    postgres = conn.dialect.name == 'postgresql'
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            if postgres:
+                # An interrupted concurrent build leaves an INVALID index
+                # behind, which IF NOT EXISTS would silently keep
+                invalid = conn.execute(text(
+                    "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ), {'name': index.name}).first()
+                if invalid:
+                    conn.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"')
+                index.dialect_kwargs['postgresql_concurrently'] = True
+            # _invoke_with() honours the ddl_if() guards declared in models.py
+            CreateIndex(index, if_not_exists=True)._invoke_with(conn)
+            print(f"✓ {table.name}.{index.name}")
+
+
+def install_blog_category_counter():
+    """Create the articles_count trigger and resync the counts; PostgreSQL only.
+
+    The trigger is replaced and the counts recomputed in one transaction, so
+    concurrent blog_posts writes wait instead of being missed by the resync.
+    """
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(BLOG_CATEGORY_COUNTER_SQL)
+    print("✓ blog_posts_category_count trigger installed")
+
+
+def main():
+    with app.app_context():
+        try:
+            # CONCURRENTLY cannot run inside a transaction block
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                if conn.dialect.name == 'postgresql':
+                    install_pg_trgm(conn)
+                create_indexes(conn)
+            if db.engine.dialect.name == 'postgresql':
+                install_blog_category_counter()
+        except Exception as e:
+            print(f"Error creating indexes: {e}")
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
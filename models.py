@@ -1,10 +1,12 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.dialects import postgresql  # noqa: F401  registers typed to_tsvector()/plainto_tsquery()
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 import secrets
 import json
+import orjson
 
 # Import db from app after it's initialized
 try:
@@ -16,6 +18,20 @@ except ImportError:
     db = SQLAlchemy(model_class=Base)
 
 
+def parsed_filters(search):
+    """additional_filters of a SavedSearch/SentSearch parsed once per string value.
+
+    The memo is keyed on the identity of the raw string, so assignment,
+    refresh(), expire() and expire-on-commit reloads all cause a re-parse.
+    """
+    raw = search.additional_filters
+    memo = search.__dict__.get('_filters_memo')
+    if memo is None or memo[0] is not raw:
+        memo = (raw, orjson.loads(raw) if raw else {})
+        search.__dict__['_filters_memo'] = memo
+    return memo[1]
+
+
 class Region(db.Model):
     """Region model for multi-regional support"""
     __tablename__ = 'regions'
@@ -179,7 +195,6 @@ class Developer(db.Model):
     
     def get_residential_complexes_list(self):
         """Get residential complexes as list"""
-        import json
         try:
             if self.residential_complexes:
                 return json.loads(self.residential_complexes)
@@ -189,7 +204,6 @@ class Developer(db.Model):
     
     def set_residential_complexes_list(self, complexes_list):
         """Set residential complexes from list"""
-        import json
         try:
             self.residential_complexes = json.dumps(complexes_list, ensure_ascii=False)
         except:
@@ -481,7 +495,10 @@ class Manager(UserMixin, db.Model):
 
 class Collection(db.Model):
     __tablename__ = 'collections'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index('ix_collections_created_by_manager_id_created_at', 'created_by_manager_id', db.text('created_at DESC')),
+        {"extend_existing": True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -580,7 +597,6 @@ class Admin(db.Model):
     
     def has_permission(self, permission):
         """Check if admin has specific permission"""
-        import json
         try:
             perms = json.loads(self.permissions)
             return perms.get('all', False) or perms.get(permission, False)
@@ -609,10 +625,22 @@ class Admin(db.Model):
         return f'<Admin {self.email}>'
 
 
+def blog_search_document(title, content):
+    """Russian full-text document over a blog title and body (the GIN-indexed expression)"""
+    empty = db.literal_column("''")
+    document = db.func.coalesce(title, empty).concat(db.literal_column("' '")).concat(db.func.coalesce(content, empty))
+    return db.func.to_tsvector(db.literal_column("'russian'"), document)
+
+
+def pg_trgm_installed(ddl, target, bind, **kw):
+    """ddl_if() guard: trigram indexes need the pg_trgm extension (see create_indexes.py)"""
+    return bind is not None and bind.exec_driver_sql(
+        "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").first() is not None
+
+
 class BlogPost(db.Model):
     """Blog post model for content management"""
     __tablename__ = 'blog_posts'
-    __table_args__ = {"extend_existing": True}
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -626,9 +654,10 @@ class BlogPost(db.Model):
     meta_keywords = db.Column(db.String(500), nullable=True)
     
     # Content management
-    status = db.Column(db.String(20), default='draft')  # draft, published, archived
+    # active_history: the articles_count flush hooks in app.py need the old values
+    status = db.column_property(db.Column(db.String(20), default='draft'), active_history=True)  # draft, published, archived
     featured_image = db.Column(db.String(500), nullable=True)
-    category = db.Column(db.String(100), nullable=True)
+    category = db.column_property(db.Column(db.String(100), nullable=True), active_history=True)
     tags = db.Column(db.Text, nullable=True)  # JSON array of tags
     
     # Author info
@@ -647,6 +676,25 @@ class BlogPost(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Full-text search over title/content, trigram indexes for the '%q%'
+    # ILIKE search and a prefix index for title suggestions (Postgres only);
+    # published posts per category
+    __table_args__ = (
+        db.Index('ix_blog_posts_search', blog_search_document(title, content),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+        db.Index('ix_blog_posts_title_trgm', title, postgresql_using='gin',
+                 postgresql_ops={'title': 'gin_trgm_ops'}).ddl_if(dialect='postgresql', callable_=pg_trgm_installed),
+        db.Index('ix_blog_posts_content_trgm', content, postgresql_using='gin',
+                 postgresql_ops={'content': 'gin_trgm_ops'}).ddl_if(dialect='postgresql', callable_=pg_trgm_installed),
+        db.Index('ix_blog_posts_excerpt_trgm', excerpt, postgresql_using='gin',
+                 postgresql_ops={'excerpt': 'gin_trgm_ops'}).ddl_if(dialect='postgresql', callable_=pg_trgm_installed),
+        db.Index('ix_blog_posts_title_lower_prefix', db.func.lower(title).label('title_lower'),
+                 postgresql_ops={'title_lower': 'text_pattern_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_blog_posts_category_published', category,
+                 postgresql_where=db.text("status = 'published'")),
+        {"extend_existing": True}
+    )
+    
     def __init__(self, **kwargs):
         super(BlogPost, self).__init__(**kwargs)
         if not self.slug and self.title:
@@ -820,7 +868,11 @@ class Document(db.Model):
 class SavedSearch(db.Model):
     """User's saved search parameters"""
     __tablename__ = 'saved_searches'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Covers "searches of a user, newest first" and per-user counts
+        db.Index('ix_saved_searches_user_id_created_at', 'user_id', db.text('created_at DESC')),
+        {"extend_existing": True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -857,28 +909,46 @@ class SavedSearch(db.Model):
     # Relationships
     user = db.relationship('User', back_populates='saved_searches')
     
+    @property
+    def filters_dict(self):
+        """Parsed additional_filters, memoized per loaded JSON string"""
+        return parsed_filters(self)
+    
+    # Columns read by serialize(); list endpoints select just these instead of full entities
+    DICT_COLUMNS = (
+        'id', 'name', 'description', 'search_type', 'location', 'property_type',
+        'price_min', 'price_max', 'size_min', 'size_max', 'developer', 'complex_name',
+        'floor_min', 'floor_max', 'cashback_min', 'additional_filters',
+        'notify_new_matches', 'created_at', 'last_used'
+    )
+    
     def to_dict(self):
         """Convert search to dictionary for easy JSON serialization"""
+        return SavedSearch.serialize(self)
+    
+    @staticmethod
+    def serialize(search):
+        """Dictionary for a SavedSearch instance or a result row with DICT_COLUMNS"""
         return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'search_type': self.search_type,
-            'location': self.location,
-            'property_type': self.property_type,
-            'price_min': self.price_min,
-            'price_max': self.price_max,
-            'size_min': self.size_min,
-            'size_max': self.size_max,
-            'developer': self.developer,
-            'complex_name': self.complex_name,
-            'floor_min': self.floor_min,
-            'floor_max': self.floor_max,
-            'cashback_min': self.cashback_min,
-            'additional_filters': self.additional_filters,
-            'notify_new_matches': self.notify_new_matches,
-            'created_at': self.created_at.strftime('%d.%m.%Y в %H:%M') if self.created_at else None,
-            'last_used': self.last_used.strftime('%d.%m.%Y в %H:%M') if self.last_used else None
+            'id': search.id,
+            'name': search.name,
+            'description': search.description,
+            'search_type': search.search_type,
+            'location': search.location,
+            'property_type': search.property_type,
+            'price_min': search.price_min,
+            'price_max': search.price_max,
+            'size_min': search.size_min,
+            'size_max': search.size_max,
+            'developer': search.developer,
+            'complex_name': search.complex_name,
+            'floor_min': search.floor_min,
+            'floor_max': search.floor_max,
+            'cashback_min': search.cashback_min,
+            'additional_filters': search.additional_filters,
+            'notify_new_matches': search.notify_new_matches,
+            'created_at': search.created_at.strftime('%d.%m.%Y в %H:%M') if search.created_at else None,
+            'last_used': search.last_used.strftime('%d.%m.%Y в %H:%M') if search.last_used else None
         }
     
     def __repr__(self):
@@ -954,7 +1024,10 @@ class ManagerSavedSearch(db.Model):
 class SentSearch(db.Model):
     """Record of searches sent from managers to clients"""
     __tablename__ = 'sent_searches'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index('ix_sent_searches_client_id_sent_at', 'client_id', db.text('sent_at DESC')),
+        {"extend_existing": True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     manager_id = db.Column(db.Integer, db.ForeignKey('managers.id'), nullable=False)
@@ -980,6 +1053,11 @@ class SentSearch(db.Model):
     client = db.relationship('User', backref='received_searches')
     manager_search = db.relationship('ManagerSavedSearch', backref='sent_instances')
     
+    @property
+    def filters_dict(self):
+        """Parsed additional_filters, memoized per loaded JSON string"""
+        return parsed_filters(self)
+    
     def __repr__(self):
         return f'<SentSearch {self.name} from Manager {self.manager_id} to User {self.client_id}>'
 
@@ -1326,7 +1404,13 @@ class RecommendationCategory(db.Model):
 class Recommendation(db.Model):
     """Manager recommendations to clients - properties or complexes"""
     __tablename__ = 'recommendations'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index('ix_recommendations_client_id_sent_at', 'client_id', db.text('sent_at DESC')),
+        db.Index('ix_recommendations_manager_id_created_at', 'manager_id', db.text('created_at DESC')),
+        db.Index('ix_recommendations_manager_id_sent_at', 'manager_id', db.text('sent_at DESC')),
+        db.Index('ix_recommendations_manager_id_client_id', 'manager_id', 'client_id'),
+        {"extend_existing": True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     manager_id = db.Column(db.Integer, db.ForeignKey('managers.id'), nullable=False)
@@ -1472,7 +1556,6 @@ class BlogCategory(db.Model):
 class BlogArticle(db.Model):
     """Blog articles with full content management"""
     __tablename__ = 'blog_articles'
-    __table_args__ = {"extend_existing": True}
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -1511,6 +1594,13 @@ class BlogArticle(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Full-text search over title/content (Postgres only)
+    __table_args__ = (
+        db.Index('ix_blog_articles_search', blog_search_document(title, content),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+        {"extend_existing": True}
+    )
+    
     # Relationships
     author = db.relationship('Manager', backref='blog_articles')
     comments = db.relationship('BlogComment', backref='article', lazy=True, cascade='all, delete-orphan')
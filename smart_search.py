@@ -1,6 +1,7 @@
 import json
 import os
 import re
+from itertools import islice
 from openai import OpenAI
 
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
@@ -213,9 +214,9 @@ class SmartSearch:
             return properties
             
         try:
-            # Подготавливаем данные о квартирах для анализа
+            # Подготавливаем данные о квартирах для анализа (в промпт идут только первые 20)
             properties_text = []
-            for prop in properties:
+            for prop in islice(properties, 20):
                 prop_text = f"ID: {prop['id']}, {prop['title']}, {prop['location']}, "
                 prop_text += f"{prop.get('description', '')}, район {prop['district']}, "
                 prop_text += f"{prop.get('nearby', '')}, {prop.get('complex_name', '')}"
@@ -228,7 +229,7 @@ class SmartSearch:
             Критерии поиска: {criteria}
             
             Доступные квартиры:
-            {chr(10).join(properties_text[:20])}  # Ограничиваем для токенов
+            {chr(10).join(properties_text)}  # Ограничиваем для токенов
             
             Верни JSON со списком ID квартир, отсортированных по релевантности:
             {{"relevant_ids": [1, 5, 12, ...]}}
@@ -246,17 +247,14 @@ class SmartSearch:
             
             # Сортируем квартиры по релевантности
             if relevant_ids:
-                sorted_properties = []
-                for prop_id in relevant_ids:
-                    for prop in properties:
-                        if prop['id'] == prop_id:
-                            sorted_properties.append(prop)
-                            break
+                by_id = {}
+                for prop in properties:
+                    by_id.setdefault(prop['id'], prop)
+                sorted_properties = [by_id[prop_id] for prop_id in dict.fromkeys(relevant_ids) if prop_id in by_id]
                 
                 # Добавляем остальные квартиры в конец
-                for prop in properties:
-                    if prop not in sorted_properties:
-                        sorted_properties.append(prop)
+                picked = {id(prop) for prop in sorted_properties}
+                sorted_properties.extend(prop for prop in properties if id(prop) not in picked)
                         
                 return sorted_properties
                 